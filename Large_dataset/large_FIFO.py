@@ -1,4 +1,10 @@
 from collections import deque
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from stack_distance import belady_anomalies, fifo_hits  # noqa: E402
+from trace_io import load_trace  # noqa: E402
 
 # Function to find page faults using FIFO
 
@@ -27,12 +33,7 @@ def pageFaults(incomingStream, n, frames):
 
 if __name__ == "__main__":
     # === Load from data.txt ===
-    incomingStream = []
-    with open("data.txt", "r") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                incomingStream.append(int(line))
+    incomingStream = load_trace("data.txt").tolist()
 
     n = len(incomingStream)
     frames = 2000  # Number of available memory frames (frame count)
@@ -46,3 +47,13 @@ if __name__ == "__main__":
     print(f"Page Faults: {page_faults}")
     print(f"Hits: {hits}")
     print(f"Hit Rate: {hit_rate:.2f}%")
+
+    # === Frame-count sweep, all sizes in one pass ===
+    frame_sizes = [100, 250, 500, 1000, 2000, 4000]
+    sweep_hits = fifo_hits(incomingStream, frame_sizes)
+    print("\nFIFO Frame Sweep:")
+    for size, size_hits in zip(frame_sizes, sweep_hits):
+        print(f"Frames: {size}, Hits: {size_hits}, "
+              f"Hit Rate: {size_hits / n * 100:.2f}%")
+    for small, large in belady_anomalies(frame_sizes, sweep_hits):
+        print(f"Belady's anomaly between {small} and {large} frames")
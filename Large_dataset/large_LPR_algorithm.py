@@ -1,37 +1,63 @@
+from collections import OrderedDict
+import math
+import os
 import random
+import sys
+
 import numpy as np
-import matplotlib.pyplot as plt
 
-# === Load access stream from data.txt ===
-access_stream = []
-with open("data.txt", "r") as file:
-    for line in file:
-        line = line.strip()
-        if line:
-            access_stream.append(int(line))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from progression import ProgressionRecorder  # noqa: E402
+from trace_io import load_trace  # noqa: E402
 
+# === Load access stream from data.txt ===
 # Optional: Limit to first 10,000 entries
-access_stream = access_stream[:10000]
+access_stream = load_trace("data.txt", length=10000).tolist()
 
 # Simulation Parameters
 cache_size = 2000  # Number of available memory frames
 
 # Initialize Q-values and cache
-q_values = {"LRU": 0.0, "MRU": 0.0}
+policies = ("LRU", "MRU")
+q_values = [0.0, 0.0]  # one Q-value per entry of policies
 alpha = 0.1     # Learning rate
 beta = 1.0      # Softmax temperature
 gamma = 0.9     # Discount factor
+seed = 42       # Seed for the policy-selection random stream
+rng_block = 4096  # Uniform draws generated per refill
 
-cache = []
+cache = OrderedDict()  # least recently used page first
 hit_count = 0
 fault_count = 0
-hit_rate_over_time = []
-
-
-def softmax(q_vals, beta):
-    exp_vals = {k: np.exp(beta * v) for k, v in q_vals.items()}
-    total = sum(exp_vals.values())
-    return {k: v / total for k, v in exp_vals.items()}
+hit_rate_over_time = ProgressionRecorder()  # bounded, see progression.py
+
+
+def softmax_choice(q_vals, beta, u):
+    # Index of the arm picked by a softmax over q_vals, given one uniform
+    # draw u in [0, 1). With two arms this is the closed form
+    # P(arm 0) = 1 / (1 + exp(d)) with d = beta * (q1 - q0), written as
+    # exp(-d) / (1 + exp(-d)) for d > 0 so that exp never overflows.
+    if len(q_vals) == 2:
+        d = beta * (q_vals[1] - q_vals[0])
+        if d > 0.0:
+            e = math.exp(-d)
+            return 0 if u * (1.0 + e) < e else 1
+        return 0 if u * (1.0 + math.exp(d)) < 1.0 else 1
+    top = max(q_vals)
+    total = 0.0
+    for v in q_vals:
+        total += math.exp(beta * (v - top))
+    threshold = u * total
+    for i, v in enumerate(q_vals):
+        threshold -= math.exp(beta * (v - top))
+        if threshold < 0.0:
+            return i
+    return len(q_vals) - 1
+
+
+rng = np.random.default_rng(seed)
+draws = rng.random(rng_block).tolist()
+draw_index = 0
 
 
 for t, page in enumerate(access_stream):
@@ -41,25 +67,28 @@ for t, page in enumerate(access_stream):
     else:
         fault_count += 1
 
-    probs = softmax(q_values, beta)
-    policy = np.random.choice(list(probs.keys()), p=list(probs.values()))
+    if draw_index == rng_block:
+        draws = rng.random(rng_block).tolist()
+        draw_index = 0
+    policy = softmax_choice(q_values, beta, draws[draw_index])
+    draw_index += 1
 
     if not hit and len(cache) >= cache_size:
-        if policy == "LRU":
-            evicted = cache.pop(0)
+        if policies[policy] == "LRU":
+            evicted, _ = cache.popitem(last=False)
         else:
-            evicted = cache.pop(-1)
+            evicted, _ = cache.popitem(last=True)
 
     if hit:
-        cache.remove(page)
-    cache.append(page)
+        cache.move_to_end(page)
+    else:
+        cache[page] = None
 
     reward = 1 if hit else -1
     old_q = q_values[policy]
-    q_values[policy] += alpha * \
-        (reward + gamma * max(q_values.values()) - old_q)
+    q_values[policy] += alpha * (reward + gamma * max(q_values) - old_q)
 
-    hit_rate_over_time.append(hit_count / (t + 1))
+    hit_rate_over_time.record(hit)
 
 # Final metrics
 hit_rate_ratio = hit_count / len(access_stream)
@@ -70,14 +99,12 @@ print(f"Final Hit Rate: {hit_rate_ratio:.3f} ({hit_rate_percent:.1f}%)")
 print(f"Total Page Faults: {fault_count}")
 print(f"Total Accesses: {len(access_stream)}")
 
-# Plot
-plt.figure(figsize=(10, 5))
-plt.plot(hit_rate_over_time, label="Hit Rate")
-plt.xlabel("Accesses")
-plt.ylabel("Hit Rate")
-plt.title("LPR Hit Rate Over Time")
-plt.ylim(0, 1)
-plt.grid(True)
-plt.legend()
-plt.tight_layout()
-plt.show()
+# Plot (see reporting.py for PLOT_OUTPUT)
+from reporting import plot_progression  # noqa: E402
+
+xs, ys = hit_rate_over_time.points()
+plot_path = plot_progression(ys, xs, title="LPR Hit Rate Over Time",
+                             xlabel="Accesses", ylabel="Hit Rate", ylim=(0, 1),
+                             label="Hit Rate", figsize=(10, 5))
+if plot_path:
+    print(f"Saved plot to {plot_path}")
@@ -1,91 +1,19 @@
+import os
+import sys
 import time
-import numpy
-from matplotlib import pyplot as plt
 
-
-class lru_2():
-    def __init__(self, **kwargs):
-        self._size = int(kwargs.get("size", 50))
-        self._cache = {}
-        self._hits = 0
-        self._misses = 0
-
-    def get(self, key):
-        (value, access_1, _) = self._cache.get(key, (None, None, None))
-        if value:
-            self._cache[key] = (value, time.time_ns(), access_1)
-            self._hits += 1
-            return value
-        self._misses += 1
-        return None
-
-    def set(self, key, value):
-        if key in self._cache:
-            return None
-        clock = time.monotonic_ns()
-        self._cache[key] = (value, clock, clock)
-        if len(self._cache) > self._size:
-            keys = tuple(self._cache.keys())
-            accesses = [c[2] for c in self._cache.values()]
-            least_recently_used = numpy.argmin(accesses)
-            evicted_key = keys[least_recently_used]
-            self._cache.pop(evicted_key)
-            return evicted_key
-        return None
-
-    @property
-    def stats(self):
-        return (self._hits, self._misses)
-
-
-class lru_1():
-    def __init__(self, **kwargs):
-        self._size = int(kwargs.get("size", 50))
-        self._cache = {}
-        self._hits = 0
-        self._misses = 0
-
-    def get(self, key):
-        (value, access_1) = self._cache.get(key, (None, None))
-        if value:
-            self._cache[key] = (value, time.time_ns())
-            self._hits += 1
-            return value
-        self._misses += 1
-        return None
-
-    def set(self, key, value):
-        if key in self._cache:
-            return None
-        clock = time.monotonic_ns()
-        self._cache[key] = (value, clock)
-        if len(self._cache) > self._size:
-            keys = tuple(self._cache.keys())
-            accesses = [c[1] for c in self._cache.values()]
-            least_recently_used = numpy.argmin(accesses)
-            evicted_key = keys[least_recently_used]
-            self._cache.pop(evicted_key)
-            return evicted_key
-        return None
-
-    @property
-    def stats(self):
-        return (self._hits, self._misses)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lru_caches import lru_1, lru_2, lru_k  # noqa: E402
+from progression import ProgressionRecorder  # noqa: E402
+from trace_io import load_trace  # noqa: E402
 
 
 if __name__ == "__main__":
     # === Load data from data.txt ===
-    data = []
-    with open("data.txt", "r") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                data.append(int(line))
     # Optional: Limit to first 10,000 entries
-    data = data[:10000]
+    data = load_trace("data.txt", length=10000).tolist()
 
-    xaxis = []
-    yaxis = []
+    progress = ProgressionRecorder()  # LRU-2 hit rate, bounded memory
     s = 2000  # Number of frames
 
     cache = lru_2(size=s)
@@ -94,12 +22,10 @@ if __name__ == "__main__":
     t = time.time_ns()
 
     for i in range(len(data)):
-        cache.get(data[i])
+        progress.record(cache.get(data[i]) is not None)
         cache.set(data[i], data[i])
         cache2.get(data[i])
         cache2.set(data[i], data[i])
-        yaxis.append(cache.stats[0] / (cache.stats[0] + cache2.stats[1]))
-        xaxis.append(i + 1)
 
     elapsed = (time.time_ns() - t) / 1e9
     print(f"Elapsed Time: {elapsed:.3f} seconds")
@@ -118,7 +44,20 @@ if __name__ == "__main__":
     print(
         f"Hit Rate: {cache2.stats[0] / (cache2.stats[0] + cache2.stats[1]):.4f}")
 
+    # === LRU-K sweep over K with the generalized engine ===
+    print(f"\nLRU-K Sweep (crp=0, retained history={s}):")
+    for k in range(1, 5):
+        cache_k = lru_k(size=s, k=k, crp=0, retained_history=s)
+        t = time.time_ns()
+        cache_k.access_many(data)
+        elapsed = (time.time_ns() - t) / 1e9
+        hits, misses = cache_k.stats
+        print(f"K={k}: Hits: {hits}, Page Faults: {misses}, "
+              f"Hit Rate: {hits / (hits + misses):.4f}, "
+              f"Elapsed Time: {elapsed:.3f} seconds")
+
     # Optional plot (uncomment if needed)
-    # fig, ax = plt.subplots()
-    # ax.plot(xaxis, yaxis)
-    # plt.show()
+    # from reporting import plot_progression
+    # xs, ys = progress.points()
+    # plot_progression(ys, xs, title="LRU-2 Hit Rate", xlabel="Accesses",
+    #                  ylabel="Hit Rate")
@@ -1,49 +1,17 @@
-import matplotlib.pyplot as plt
+import os
+import sys
 
-# Optimal Page Replacement Algorithm (Belady's MIN)
-
-
-def simulate_optimal(trace, cache_size):
-    cache = set()
-    page_faults = 0
-    hits = 0
-    hit_rates = []  # to track hit rate progression
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from optimal import simulate_optimal  # noqa: E402
+from trace_io import load_trace  # noqa: E402
 
-    for i, page in enumerate(trace):
-        if page in cache:
-            hits += 1
-        else:
-            page_faults += 1
-            if len(cache) < cache_size:
-                cache.add(page)
-            else:
-                # Find the page that will be used farthest in the future
-                future_uses = {p: float('inf') for p in cache}
-                for j in range(i + 1, len(trace)):
-                    if trace[j] in future_uses and future_uses[trace[j]] == float('inf'):
-                        future_uses[trace[j]] = j
-                page_to_evict = max(future_uses, key=future_uses.get)
-                cache.remove(page_to_evict)
-                cache.add(page)
-
-        # Track cumulative hit rate at this point
-        current_hit_rate = (hits / (i + 1)) * 100
-        hit_rates.append(current_hit_rate)
-
-    final_hit_rate = (hits / len(trace)) * 100
-    return page_faults, hits, final_hit_rate, hit_rates
+# Optimal Page Replacement Algorithm (Belady's MIN)
 
 
 if __name__ == "__main__":
     # === Load trace from data.txt ===
-    trace = []
-    with open("data.txt", "r") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                trace.append(int(line))
-    # Optional: Limit to first 10,000
-    trace = trace[:10000]
+    # Optional: Limit to first 10,000 entries
+    trace = load_trace("data.txt", length=10000).tolist()
 
     cache_size = 2000  # Set your desired frame size
 
@@ -58,14 +26,13 @@ if __name__ == "__main__":
     print(f"Total Hits: {total_hits}")
     print(f"Hit Rate: {hit_rate:.2f}%")
 
-    # Plot hit rate progression
-    plt.figure(figsize=(8, 4))
-    plt.plot(range(1, len(trace) + 1), hit_rate_progress,
-             marker='o', linestyle='-', color='mediumseagreen')
-    plt.title('Hit Rate Progression – Optimal Page Replacement')
-    plt.xlabel('Access Count')
-    plt.ylabel('Cumulative Hit Rate (%)')
-    plt.ylim(0, 100)
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
+    # Plot hit rate progression (see reporting.py for PLOT_OUTPUT)
+    from reporting import plot_progression
+    xs, ys = hit_rate_progress.points()
+    plot_path = plot_progression(
+        ys, xs,
+        title='Hit Rate Progression – Optimal Page Replacement',
+        xlabel='Access Count', ylabel='Cumulative Hit Rate (%)', ylim=(0, 100),
+        marker='o', linestyle='-', color='mediumseagreen')
+    if plot_path:
+        print(f"Saved plot to {plot_path}")
@@ -0,0 +1,271 @@
+"""
+Reproducible benchmarks for the policies in policies.py.
+Every case (policy x trace size x distinct pages x frames) runs in a fresh
+process so its peak RSS is its own. Synthetic traces are Zipf-distributed over a
+fixed number of distinct pages, generated from a seed and written once as
+binary traces that the workers memory-map. Each case reports ns/access (best of
+--repeat runs), hits, peak RSS and, with --allocations, the peak of memory
+allocated through Python's allocator (tracemalloc, measured in a separate run
+because it slows the interpreter down).
+Results are written as JSON. Given a --baseline from an earlier run, cases that
+got slower by more than --tolerance are reported as regressions and the exit
+status is 1, as is any change in hit counts. A case that raises or whose
+process dies is recorded as a failed row (with its error) and also makes the
+exit status 1.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue as queue_module
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from policies import POLICIES, hit_count
+from trace_io import ensure_binary, open_trace, write_trace
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def make_trace(path, accesses, distinct, skew=1.0, seed=0,
+               chunk_size=1 << 22):
+    """
+    Write a synthetic trace of the given length whose pages follow a Zipf
+    distribution with exponent skew over `distinct` pages, in random order of
+    popularity.
+    """
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, distinct + 1) ** skew
+    cdf = np.cumsum(weights)
+    cdf /= cdf[-1]
+    page_ids = rng.permutation(distinct).astype(np.uint32)
+
+    def chunks():
+        remaining = accesses
+        while remaining:
+            size = min(chunk_size, remaining)
+            ranks = np.searchsorted(cdf, rng.random(size), side="right")
+            yield page_ids[np.minimum(ranks, distinct - 1)]
+            remaining -= size
+
+    write_trace(path, chunks())
+    return path
+
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _measure(policy_name, trace_path, frames, repeat, allocations):
+    trace = open_trace(trace_path)
+    policy_class = POLICIES[policy_name]
+    best = None
+    for _ in range(repeat):
+        t = time.perf_counter_ns()
+        mask = policy_class(frames).run(trace)
+        elapsed = time.perf_counter_ns() - t
+        best = elapsed if best is None else min(best, elapsed)
+    result = {
+        "ns_per_access": best / len(trace),
+        "seconds": best / 1e9,
+        "hits": hit_count(mask),
+        "peak_rss_kb": _peak_rss_kb(),
+        "peak_alloc_bytes": None,
+    }
+    if allocations:
+        del mask
+        tracemalloc.start()
+        policy_class(frames).run(trace)
+        result["peak_alloc_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def _measure_in_child(queue, *args):
+    try:
+        result = _measure(*args)
+    except BaseException as e:
+        result = {"error": f"{type(e).__name__}: {e}"}
+    queue.put(result)
+
+
+def _failed(error):
+    return {"ns_per_access": None, "seconds": None, "hits": None,
+            "peak_rss_kb": None, "peak_alloc_bytes": None, "error": error}
+
+
+def measure(policy_name, trace_path, frames, repeat=3, allocations=False,
+            poll_seconds=1.0):
+    """
+    Run one case in a fresh process and return its measurements. A case that
+    raises, or whose process dies (e.g. killed for running out of memory),
+    returns a row with "error" set and None measurements instead.
+    """
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(
+        target=_measure_in_child,
+        args=(queue, policy_name, trace_path, frames, repeat, allocations))
+    process.start()
+    result = None
+    while result is None:
+        try:
+            result = queue.get(timeout=poll_seconds)
+        except queue_module.Empty:
+            if not process.is_alive():
+                # the result may have been queued just before the exit
+                try:
+                    result = queue.get(timeout=poll_seconds)
+                except queue_module.Empty:
+                    result = {"error": "worker exited with code "
+                                       f"{process.exitcode}"}
+    process.join()
+    if "error" in result:
+        return _failed(result["error"])
+    result["error"] = None
+    return result
+
+
+def run_benchmarks(policies, sizes, distinct_counts, frame_counts, repeat=3,
+                   allocations=False, skew=1.0, seed=0, trace_path=None,
+                   log=sys.stderr):
+    """
+    Benchmark every combination and return a list of result rows. With
+    trace_path, that trace is used (cut to each size) instead of synthetic ones
+    and distinct_counts is ignored.
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for accesses in sizes:
+            for distinct in ([None] if trace_path else distinct_counts):
+                if trace_path:
+                    source = open_trace(ensure_binary(trace_path), length=accesses)
+                    accesses = len(source)
+                    distinct = int(np.unique(source).size)
+                    path = os.path.join(tmp, f"trace-{accesses}.trace")
+                    write_trace(path, [source], source.dtype)
+                else:
+                    path = make_trace(
+                        os.path.join(tmp, f"zipf-{accesses}-{distinct}.trace"),
+                        accesses, distinct, skew, seed)
+                for frames in frame_counts:
+                    for policy_name in policies:
+                        result = measure(policy_name, path, frames, repeat,
+                                         allocations)
+                        row = {"policy": policy_name, "accesses": accesses,
+                               "distinct": distinct, "frames": frames}
+                        row.update(result)
+                        rows.append(row)
+                        if log:
+                            if row["error"]:
+                                outcome = f"FAILED {row['error']}"
+                            else:
+                                outcome = f"{row['ns_per_access']:.0f} ns/access"
+                            print(f"{policy_name:>10} n={accesses} "
+                                  f"distinct={distinct} frames={frames}: "
+                                  f"{outcome}", file=log)
+    return rows
+
+
+def _key(row):
+    return (row["policy"], row["accesses"], row["distinct"], row["frames"])
+
+
+def compare(rows, baseline_rows, tolerance=0.10):
+    """
+    Compare results to a baseline. Returns a list of human-readable problems:
+    failed cases, throughput regressions beyond tolerance and changed hit
+    counts.
+    """
+    baseline = {_key(row): row for row in baseline_rows}
+    problems = []
+    for row in rows:
+        old = baseline.get(_key(row))
+        if old is None or old.get("error"):
+            continue
+        name = "{} n={} distinct={} frames={}".format(*_key(row))
+        if row.get("error"):
+            problems.append(f"{name}: failed, {row['error']}")
+            continue
+        if old["hits"] != row["hits"]:
+            problems.append(f"{name}: hits changed {old['hits']} -> {row['hits']}")
+        if row["ns_per_access"] > old["ns_per_access"] * (1 + tolerance):
+            problems.append(
+                f"{name}: {old['ns_per_access']:.0f} -> "
+                f"{row['ns_per_access']:.0f} ns/access "
+                f"(+{(row['ns_per_access'] / old['ns_per_access'] - 1) * 100:.0f}%)")
+    return problems
+
+
+def _int_list(text):
+    return [int(float(x)) for x in text.split(",") if x]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the page replacement policies.")
+    parser.add_argument("--policies", default=",".join(POLICIES),
+                        help="comma separated policy names")
+    parser.add_argument("--sizes", type=_int_list, default=[10_000, 100_000],
+                        help="trace lengths, e.g. 1e4,1e6,1e8")
+    parser.add_argument("--distinct", type=_int_list, default=[1_000, 100_000],
+                        help="distinct page counts of the synthetic traces")
+    parser.add_argument("--frames", type=_int_list, default=[100, 2000])
+    parser.add_argument("--trace", default=None,
+                        help="benchmark on this trace instead of synthetic ones")
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--allocations", action="store_true",
+                        help="also measure peak Python allocations")
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--baseline", default=None,
+                        help="earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+
+    rows = run_benchmarks(args.policies.split(","), args.sizes, args.distinct,
+                          args.frames, args.repeat, args.allocations,
+                          args.skew, args.seed, args.trace)
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "skew": args.skew,
+            "seed": args.seed,
+            "trace": args.trace,
+        },
+        "results": rows,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(rows)} results to {args.output}")
+    failed = [row for row in rows if row["error"]]
+    for row in failed:
+        print("FAILED {} n={} distinct={} frames={}: ".format(*_key(row))
+              + row["error"])
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline_rows = json.load(f)["results"]
+        problems = compare(rows, baseline_rows, args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        if problems:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+    if failed:
+        sys.exit(1)
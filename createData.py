@@ -1,11 +1,147 @@
-with open("C:\\Users\\tyler\\Documents\\GitHub\\Page-Replacement-Algorithms-Comparative-Performance-Analysis-for-Modern-Virtual-Memory-Systems-\\twitter.txt", "r") as twitter:
-    data = twitter.read()
-    data = data.split("\n")
-    with open("./data.txt", "w") as file:
-        for i in range(10000):
-            x = data[i].split("\t")
-            file.write(x[0])
-            file.write("\n")
-            file.write(x[1])
-            file.write("\n")
-            
+"""
+Build a page reference trace from an edge list or an address log.
+Every line contributes the page ids found in the selected columns, in order, so
+an edge list "src<TAB>dst" becomes the references src, dst as before. The input
+is read in fixed-size chunks and written out as it goes, so memory stays bounded
+no matter how large the input is.
+Output ending in .txt is written as text, one page id per line; anything else
+is written in the binary trace format of trace_io, optionally split into shards
+of a fixed number of references.
+"""
+import argparse
+import os
+
+import numpy as np
+
+from trace_io import TRACE_SUFFIX, TraceWriter
+
+
+def read_references(path, columns=(0, 1), base=10, page_shift=0,
+                    max_rows=None, chunk_bytes=1 << 24):
+    """
+    Yield uint64 arrays of page references from a whitespace separated file.
+    Parameters:
+        path: str
+            Edge list or address log. Empty lines and lines starting with '#'
+            or '%' are skipped.
+        columns: tuple of int
+            Columns to take from each line, flattened row by row.
+        base: int
+            Number base of the ids, e.g. 16 for hex addresses.
+        page_shift: int
+            Right shift applied to every id, e.g. 12 to turn byte addresses into
+            4 KiB page numbers.
+        max_rows: int (optional)
+            Stop after this many input rows.
+        chunk_bytes: int
+            Approximate amount of text read per chunk.
+    """
+    columns = list(columns)
+    rows = 0
+    with open(path, "r") as f:
+        while max_rows is None or rows < max_rows:
+            lines = f.readlines(chunk_bytes)
+            if not lines:
+                break
+            lines = [line for line in lines
+                     if line.strip() and line[0] not in "#%"]
+            if max_rows is not None:
+                lines = lines[:max_rows - rows]
+            rows += len(lines)
+            if not lines:
+                continue
+
+            rows_fields = [line.split() for line in lines]
+            width = len(rows_fields[0])
+            if width > max(columns) and all(len(fields) == width
+                                            for fields in rows_fields):
+                # every line has the same number of fields
+                tokens = np.array(rows_fields)[:, columns].ravel()
+            else:
+                tokens = [fields[c] for fields in rows_fields
+                          for c in columns if c < len(fields)]
+
+            if base == 10:
+                pages = np.asarray(tokens).astype(np.uint64)
+            else:
+                pages = np.array([int(t, base) for t in tokens], dtype=np.uint64)
+            if page_shift:
+                pages >>= np.uint64(page_shift)
+            yield pages
+
+
+def write_text(path, chunks):
+    count = 0
+    with open(path, "w") as f:
+        for chunk in chunks:
+            if chunk.size:
+                f.write("\n".join(map(str, chunk.tolist())))
+                f.write("\n")
+                count += chunk.size
+    return [(path, count)]
+
+
+def write_binary(path, chunks, dtype="uint32", shard_size=None):
+    """
+    Write references to one binary trace, or to shards named
+    <stem>-00000.trace, <stem>-00001.trace, ... of shard_size references each.
+    Returns a list of (path, count) for the files written.
+    """
+    if not shard_size:
+        with TraceWriter(path, dtype) as writer:
+            for chunk in chunks:
+                writer.append(chunk)
+        return [(path, writer.count)]
+
+    stem = os.path.splitext(path)[0]
+    written = []
+    writer = None
+    try:
+        for chunk in chunks:
+            while chunk.size:
+                if writer is None:
+                    shard_path = f"{stem}-{len(written):05d}{TRACE_SUFFIX}"
+                    writer = TraceWriter(shard_path, dtype)
+                room = shard_size - writer.count
+                writer.append(chunk[:room])
+                chunk = chunk[room:]
+                if writer.count == shard_size:
+                    writer.close()
+                    written.append((writer.path, writer.count))
+                    writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+            written.append((writer.path, writer.count))
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("input", nargs="?", default="twitter.txt",
+                        help="edge list or address log (default: twitter.txt)")
+    parser.add_argument("output", nargs="?", default="data.txt",
+                        help="output trace, .txt for text (default: data.txt)")
+    parser.add_argument("--columns", default="0,1",
+                        help="comma separated columns to take from each line")
+    parser.add_argument("--rows", type=int, default=None,
+                        help="only read this many input rows")
+    parser.add_argument("--base", type=int, default=10,
+                        help="number base of the ids (16 for hex addresses)")
+    parser.add_argument("--page-shift", type=int, default=0,
+                        help="right shift turning addresses into page numbers")
+    parser.add_argument("--dtype", default="uint32", choices=["uint32", "uint64"])
+    parser.add_argument("--shard-size", type=int, default=None,
+                        help="references per binary shard")
+    args = parser.parse_args()
+
+    columns = tuple(int(c) for c in args.columns.split(","))
+    chunks = read_references(args.input, columns, args.base, args.page_shift,
+                             args.rows)
+    if args.output.endswith(".txt"):
+        written = write_text(args.output, chunks)
+    else:
+        written = write_binary(args.output, chunks, args.dtype, args.shard_size)
+
+    for path, count in written:
+        print(f"Wrote {count} page references to {path}")
@@ -0,0 +1,94 @@
+"""
+Buffered binary log of replacement decisions.
+Every access is one event (step, page, hit, victim), with victim -1 when
+nothing was evicted. Events go into a preallocated NumPy record buffer; a full
+buffer is appended column by column to raw side files, and close() packs the
+columns into one .npz holding an array per column:
+    events = numpy.load("run.npz")
+    evictions = events["victim"][events["victim"] >= 0]
+Memory stays at one buffer however long the run is, and nothing is formatted
+as text on the way.
+"""
+import os
+import zipfile
+
+import numpy as np
+
+EVENT_DTYPE = np.dtype([("step", "<i8"), ("page", "<i8"), ("hit", "?"),
+                        ("victim", "<i8")])
+NO_VICTIM = -1
+
+
+class EventLog():
+    def __init__(self, path, buffer_size=1 << 16):
+        """
+        Parameters:
+            path: str
+                Destination, ".npz" is appended if missing.
+            buffer_size: int
+                Events held in memory between flushes.
+        """
+        if not path.endswith(".npz"):
+            path += ".npz"
+        self.path = path
+        self.count = 0
+        self._buffer = np.empty(buffer_size, dtype=EVENT_DTYPE)
+        self._fill = 0
+        self._columns = {name: open(self._column_path(name), "wb")
+                         for name in EVENT_DTYPE.names}
+
+    def _column_path(self, name):
+        return f"{self.path}.{name}.tmp"
+
+    def record(self, step, page, hit, victim=NO_VICTIM):
+        self._buffer[self._fill] = (step, page, hit, victim)
+        self._fill += 1
+        if self._fill == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        if self._fill:
+            for name, f in self._columns.items():
+                self._buffer[name][:self._fill].tofile(f)
+            self.count += self._fill
+            self._fill = 0
+
+    def close(self):
+        if self._columns is None:
+            return
+        self.flush()
+        for f in self._columns.values():
+            f.close()
+        # copy every column into the archive as an .npy member, a chunk at a
+        # time, so packing needs no more memory than logging did
+        with zipfile.ZipFile(self.path, "w", zipfile.ZIP_STORED,
+                             allowZip64=True) as archive:
+            for name in EVENT_DTYPE.names:
+                column_path = self._column_path(name)
+                dtype = EVENT_DTYPE[name]
+                with archive.open(name + ".npy", "w", force_zip64=True) as out, \
+                        open(column_path, "rb") as column:
+                    np.lib.format.write_array_header_1_0(out, {
+                        "descr": np.lib.format.dtype_to_descr(dtype),
+                        "fortran_order": False,
+                        "shape": (self.count,),
+                    })
+                    while True:
+                        chunk = column.read(1 << 24)
+                        if not chunk:
+                            break
+                        out.write(chunk)
+                os.remove(column_path)
+        self._columns = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_events(path):
+    """Load an event log as a dict of column arrays."""
+    with np.load(path) as events:
+        return {name: events[name] for name in events.files}
@@ -13,147 +13,17 @@ This can also be used as the index for an external cache (for example in plasma)
 the .set returns the evicted item which the calling function can then evict from the
 external cache.
 """
+import os
+import sys
 import time
 
-import numpy
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lru_caches import lru_1  # noqa: E402
 
 
-class lru_2():
-    def __init__(self, **kwargs):
-        """
-        Parameters:
-            size: int (optional)
-                The maximim number of items maintained in the cache.
-        """
-        self._size = int(kwargs.get("size", 50))
-        self._cache = {}
-        self._hits = 0
-        self._misses = 0
-
-    def get(self, key):
-        """
-        Parameters:
-            key: any (hashable)
-                The key to reference the cached item
-        """
-        # we're disposing of access_2 (the penultimate access), recording this access
-        # as the latest and making the access_1 the new penultimate access
-        (value, access_1, _) = self._cache.get(key, (None, None, None))
-        if value:
-            self._cache[key] = (value, time.time_ns(), access_1)
-            self._hits += 1
-            return value
-        self._misses += 1
-        return None
-
-
-    def set(self, key, value):
-        """
-        Parameters:
-            key: any (hashable)
-                The key to reference the cached item
-            value: any
-                The value to hold in the cache
-        """
-        # if we're already in the cache - do nothing
-        if key in self._cache:
-            return None
-
-        # create an initial entry for the new item
-        clock = time.monotonic_ns()
-        self._cache[key] = (value, clock, clock)
-
-        # If we're  full, we want to remove an item from the cache.
-        # We choose the item to remove based on the penultimate access for that item.
-        if len(self._cache) > self._size:
-
-            keys = tuple(self._cache.keys())
-            accesses = []
-            for c in self._cache.values():
-                accesses.append(c[2])
-            least_recently_used = numpy.argmin(accesses)
-            evicted_key = keys[least_recently_used]
-
-            self._cache.pop(evicted_key)
-
-            return evicted_key
-
-        return None
-
-    @property
-    def stats(self):
-        # return hits, misses
-        return (self._hits, self._misses)
-
-class lru_1():
-    def __init__(self, **kwargs):
-        """
-        Parameters:
-            size: int (optional)
-                The maximim number of items maintained in the cache.
-        """
-        self._size = int(kwargs.get("size", 50))
-        self._cache = {}
-        self._hits = 0
-        self._misses = 0
-
-    def get(self, key):
-        """
-        Parameters:
-            key: any (hashable)
-                The key to reference the cached item
-        """
-        # we're disposing of access_2 (the penultimate access), recording this access
-        # as the latest and making the access_1 the new penultimate access
-        (value, access_1) = self._cache.get(key, (None, None))
-        if value:
-            self._cache[key] = (value, time.time_ns())
-            self._hits += 1
-            return value
-        self._misses += 1
-        return None
-
-
-    def set(self, key, value):
-        """
-        Parameters:
-            key: any (hashable)
-                The key to reference the cached item
-            value: any
-                The value to hold in the cache
-        """
-        # if we're already in the cache - do nothing
-        if key in self._cache:
-            return None
-
-        # create an initial entry for the new item
-        clock = time.monotonic_ns()
-        self._cache[key] = (value, clock)
-
-        # If we're  full, we want to remove an item from the cache.
-        # We choose the item to remove based on the penultimate access for that item.
-        if len(self._cache) > self._size:
-
-            keys = tuple(self._cache.keys())
-            accesses = []
-            for c in self._cache.values():
-                accesses.append(c[1])
-
-            least_recently_used = numpy.argmin(accesses)
-            evicted_key = keys[least_recently_used]
-
-            self._cache.pop(evicted_key)
-
-            return evicted_key
-
-        return None
-
-    @property
-    def stats(self):
-        # return hits, misses
-        return (self._hits, self._misses)
-    
 if __name__ == "__main__":
+    import numpy
+
     s = 90
     cache = lru_1(size=s)
 
@@ -0,0 +1,398 @@
+"""
+The LRU caches shared by the scripts under lru/ and Large_dataset/ and by
+policies.LRUKPolicy: lru_1 (classic LRU on an OrderedDict), lru_2 (LRU-2) and
+lru_k (LRU-K with a correlated reference period and retained history), the
+last two kept in order of eviction by _IndexedHeap.
+Every cache answers get(key) with the value or None and set(key, value) with
+the evicted key, if any.
+"""
+from collections import OrderedDict
+
+
+class _IndexedHeap():
+    """
+    A binary min-heap of (priority, key) pairs that also keeps the slot of every
+    key, so the priority of a cached item can be changed in O(log n) without
+    searching the heap for it.
+    """
+    def __init__(self):
+        self._heap = []
+        self._slot = {}
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, key, priority):
+        self._heap.append((priority, key))
+        self._slot[key] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def update(self, key, priority):
+        i = self._slot[key]
+        old_priority = self._heap[i][0]
+        self._heap[i] = (priority, key)
+        if priority < old_priority:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def pop(self):
+        # remove and return the key with the smallest priority
+        heap = self._heap
+        _, key = heap[0]
+        last = heap.pop()
+        del self._slot[key]
+        if heap:
+            heap[0] = last
+            self._slot[last[1]] = 0
+            self._sift_down(0)
+        return key
+
+    def _sift_up(self, i):
+        heap = self._heap
+        slot = self._slot
+        item = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if heap[parent][0] <= item[0]:
+                break
+            heap[i] = heap[parent]
+            slot[heap[i][1]] = i
+            i = parent
+        heap[i] = item
+        slot[item[1]] = i
+
+    def _sift_down(self, i):
+        heap = self._heap
+        slot = self._slot
+        n = len(heap)
+        item = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if item[0] <= heap[child][0]:
+                break
+            heap[i] = heap[child]
+            slot[heap[i][1]] = i
+            i = child
+        heap[i] = item
+        slot[item[1]] = i
+
+
+class lru_2():
+    def __init__(self, **kwargs):
+        """
+        Parameters:
+            size: int (optional)
+                The maximim number of items maintained in the cache.
+        """
+        self._size = int(kwargs.get("size", 50))
+        self._cache = {}
+        # min-heap of cached keys ordered by their penultimate access
+        self._order = _IndexedHeap()
+        self._clock = 0  # logical time, advanced once per access
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key, tick=None):
+        """
+        Parameters:
+            key: any (hashable)
+                The key to reference the cached item
+            tick: int (optional)
+                Logical time of this access, by default one past the last
+        """
+        # we're disposing of access_2 (the penultimate access), recording this access
+        # as the latest and making the access_1 the new penultimate access
+        entry = self._cache.get(key)
+        if entry is not None:
+            (value, access_1, _) = entry
+            self._cache[key] = (value, self._tick(tick), access_1)
+            self._order.update(key, access_1)
+            self._hits += 1
+            return value
+        self._misses += 1
+        return None
+
+
+    def set(self, key, value, tick=None):
+        """
+        Parameters:
+            key: any (hashable)
+                The key to reference the cached item
+            value: any
+                The value to hold in the cache
+            tick: int (optional)
+                Logical time of this access, by default one past the last
+        """
+        # if we're already in the cache - do nothing
+        if key in self._cache:
+            return None
+
+        # create an initial entry for the new item
+        clock = self._tick(tick)
+        self._cache[key] = (value, clock, clock)
+        self._order.push(key, clock)
+
+        # If we're  full, we want to remove an item from the cache.
+        # We choose the item to remove based on the penultimate access for that item,
+        # which is the top of the heap.
+        if len(self._cache) > self._size:
+
+            evicted_key = self._order.pop()
+            self._cache.pop(evicted_key)
+
+            return evicted_key
+
+        return None
+
+    def _tick(self, tick=None):
+        # logical clock: every access gets the next tick unless one is supplied
+        self._clock = self._clock + 1 if tick is None else tick
+        return self._clock
+
+    def access_many(self, keys):
+        """
+        Reference each key in turn, caching misses with the key as their value.
+        Parameters:
+            keys: iterable of any (hashable)
+        Returns:
+            The number of hits among these accesses.
+        """
+        hits = self._hits
+        get = self.get
+        set = self.set
+        for key in keys:
+            if get(key) is None:
+                set(key, key)
+        return self._hits - hits
+
+    @property
+    def stats(self):
+        # return hits, misses
+        return (self._hits, self._misses)
+
+class lru_1():
+    def __init__(self, **kwargs):
+        """
+        Parameters:
+            size: int (optional)
+                The maximim number of items maintained in the cache.
+        """
+        self._size = int(kwargs.get("size", 50))
+        # OrderedDict is a hash map over a doubly linked list, kept from the least
+        # recently used item at the front to the most recently used at the back
+        self._cache = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key):
+        """
+        Parameters:
+            key: any (hashable)
+                The key to reference the cached item
+        """
+        # a hit moves the item to the most recently used end
+        if key in self._cache:
+            value = self._cache[key]
+            self._cache.move_to_end(key)
+            self._hits += 1
+            return value
+        self._misses += 1
+        return None
+
+
+    def set(self, key, value):
+        """
+        Parameters:
+            key: any (hashable)
+                The key to reference the cached item
+            value: any
+                The value to hold in the cache
+        """
+        # if we're already in the cache - do nothing
+        if key in self._cache:
+            return None
+
+        # create an initial entry for the new item at the most recently used end
+        self._cache[key] = value
+
+        # If we're  full, we want to remove an item from the cache.
+        # We choose the least recently used item, which is at the front.
+        if len(self._cache) > self._size:
+
+            evicted_key, _ = self._cache.popitem(last=False)
+
+            return evicted_key
+
+        return None
+
+    def access_many(self, keys):
+        """
+        Reference each key in turn, caching misses with the key as their value.
+        Parameters:
+            keys: iterable of any (hashable)
+        Returns:
+            The number of hits among these accesses.
+        """
+        hits = self._hits
+        get = self.get
+        set = self.set
+        for key in keys:
+            if get(key) is None:
+                set(key, key)
+        return self._hits - hits
+
+    @property
+    def stats(self):
+        # return hits, misses
+        return (self._hits, self._misses)
+
+class lru_k():
+    def __init__(self, **kwargs):
+        """
+        Full LRU-K as described by O'Neil, O'Neil and Weikum. Time is a logical
+        clock that advances on every .get call (or is supplied as tick), so .set
+        is expected to follow the .get that missed.
+        Parameters:
+            size: int (optional)
+                The maximim number of items maintained in the cache.
+            k: int (optional)
+                How many past accesses are tracked; the victim is the item whose
+                k-th most recent access is furthest in the past.
+            crp: int (optional)
+                Correlated reference period, in accesses. Re-references within
+                this period of the last access are treated as one burst and do
+                not change the item's history, and items inside it are not
+                eligible for eviction.
+            retained_history: int (optional)
+                How many evicted items keep their access history, so that a
+                quickly re-referenced item is not treated as brand new.
+        """
+        self._size = int(kwargs.get("size", 50))
+        self._k = int(kwargs.get("k", 2))
+        self._crp = int(kwargs.get("crp", 0))
+        self._retained_size = int(kwargs.get("retained_history", 0))
+        # key -> (value, history, last) where history holds the last k
+        # uncorrelated access times, most recent first, and 0 means "never"
+        self._cache = {}
+        # evicted key -> (history, last), oldest eviction first
+        self._retained = OrderedDict()
+        # min-heap of cached keys ordered by (k-th most recent access, last access)
+        self._order = _IndexedHeap()
+        self._clock = 0
+        self._hits = 0
+        self._misses = 0
+
+    def __contains__(self, key):
+        # whether key is cached, without counting an access
+        return key in self._cache
+
+    def get(self, key, tick=None):
+        """
+        Parameters:
+            key: any (hashable)
+                The key to reference the cached item
+            tick: int (optional)
+                Logical time of this access, by default one past the last
+        """
+        self._clock = self._clock + 1 if tick is None else tick
+        entry = self._cache.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        (value, history, last) = entry
+        now = self._clock
+        if now - last > self._crp:
+            # a new, uncorrelated reference: close the previous burst by shifting
+            # the older history forward by the length of that burst
+            correlated_period = last - history[0]
+            history = [now] + [h + correlated_period if h else 0 for h in history[:-1]]
+        self._cache[key] = (value, history, now)
+        self._order.update(key, (history[-1], now))
+        self._hits += 1
+        return value
+
+
+    def set(self, key, value, tick=None):
+        """
+        Parameters:
+            key: any (hashable)
+                The key to reference the cached item
+            value: any
+                The value to hold in the cache
+            tick: int (optional)
+                Logical time of this access, by default the tick of the
+                preceding get
+        """
+        # if we're already in the cache - do nothing
+        if key in self._cache:
+            return None
+
+        if tick is not None:
+            self._clock = tick
+        now = self._clock
+        evicted_key = None
+        if len(self._cache) >= self._size:
+            evicted_key = self._evict(now)
+
+        # pick up the retained history of a recently evicted item, if any
+        (history, _) = self._retained.pop(key, (None, None))
+        if history is None:
+            history = [now] + [0] * (self._k - 1)
+        else:
+            history = [now] + history[:-1]
+        self._cache[key] = (value, history, now)
+        self._order.push(key, (history[-1], now))
+
+        return evicted_key
+
+    def _evict(self, now):
+        # Pop candidates in order of their k-th most recent access, skipping items
+        # still inside their correlated reference period. When every item is
+        # inside it, the first candidate is evicted anyway.
+        skipped = []
+        victim = None
+        while len(self._order):
+            candidate = self._order.pop()
+            if now - self._cache[candidate][2] > self._crp:
+                victim = candidate
+                break
+            skipped.append(candidate)
+        if victim is None:
+            victim = skipped.pop(0)
+        for candidate in skipped:
+            (_, history, last) = self._cache[candidate]
+            self._order.push(candidate, (history[-1], last))
+
+        (_, history, last) = self._cache.pop(victim)
+        if self._retained_size > 0:
+            self._retained[victim] = (history, last)
+            if len(self._retained) > self._retained_size:
+                self._retained.popitem(last=False)
+        return victim
+
+    def access_many(self, keys):
+        """
+        Reference each key in turn, caching misses with the key as their value.
+        Parameters:
+            keys: iterable of any (hashable)
+        Returns:
+            The number of hits among these accesses.
+        """
+        hits = self._hits
+        get = self.get
+        set = self.set
+        for key in keys:
+            if get(key) is None:
+                set(key, key)
+        return self._hits - hits
+
+    @property
+    def stats(self):
+        # return hits, misses
+        return (self._hits, self._misses)
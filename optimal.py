@@ -0,0 +1,87 @@
+"""
+Belady's optimal page replacement (MIN), shared by the OPT scripts,
+policies.OPTPolicy and stack_distance.
+OPT needs the future: one backward pass gives the index of the next reference
+of every access (compute_next_use), and residents sit in a max-heap keyed by
+it, whose outdated entries are skipped when popped and dropped in a rebuild
+once they outnumber the live ones, so a run is O(n log c).
+"""
+import heapq
+
+import numpy as np
+
+from progression import ProgressionRecorder
+
+
+def compute_next_use(trace):
+    # One backward pass: next_use[i] is the index of the next access to
+    # trace[i], or len(trace) if the page is never referenced again.
+    n = len(trace)
+    next_use = [n] * n
+    last_seen = {}
+    for i in range(n - 1, -1, -1):
+        page = trace[i]
+        next_use[i] = last_seen.get(page, n)
+        last_seen[page] = i
+    return next_use
+
+
+def _optimal_hits(trace, cache_size):
+    # yield whether every access of the trace hits
+    next_use = compute_next_use(trace)
+    cache = {}  # resident page -> index of its next use
+    heap = []  # max-heap of (-next use, access index, page), stale entries skipped
+    for i, page in enumerate(trace):
+        nxt = next_use[i]
+        hit = page in cache
+        if not hit and len(cache) >= cache_size:
+            # Evict the resident page that will be used farthest in the future
+            while True:
+                neg_nxt, _, victim = heapq.heappop(heap)
+                if cache.get(victim) == -neg_nxt:
+                    break
+            del cache[victim]
+        cache[page] = nxt
+        heapq.heappush(heap, (-nxt, i, page))
+
+        # Hits leave stale entries behind; rebuild once they outnumber live ones
+        if len(heap) > 2 * cache_size + 16:
+            heap = [(-nu, j, p) for j, (p, nu) in enumerate(cache.items())]
+            heapq.heapify(heap)
+        yield hit
+
+
+def optimal_hits(trace, cache_size):
+    """
+    Parameters:
+        trace: sequence of hashable page ids
+        cache_size: int
+    Returns:
+        A numpy bool array, True where the access was a hit.
+    """
+    return np.fromiter(_optimal_hits(trace, cache_size), dtype=bool,
+                       count=len(trace))
+
+
+def simulate_optimal(trace, cache_size, progress=None):
+    """
+    Returns:
+        (page_faults, hits, hit rate in percent, progress), progress being the
+        ProgressionRecorder the hits were recorded to (a new one in percent by
+        default).
+    """
+    page_faults = 0
+    hits = 0
+    if progress is None:  # to track hit rate progression, in percent
+        progress = ProgressionRecorder(scale=100)
+
+    for hit in _optimal_hits(trace, cache_size):
+        if hit:
+            hits += 1
+        else:
+            page_faults += 1
+        # Track cumulative hit rate at this point
+        progress.record(hit)
+
+    final_hit_rate = (hits / len(trace)) * 100
+    return page_faults, hits, final_hit_rate, progress
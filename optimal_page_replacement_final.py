@@ -1,38 +1,8 @@
 import random
-import matplotlib.pyplot as plt
 
-# Optimal Page Replacement Algorithm (Belady's MIN)
-
-
-def simulate_optimal(trace, cache_size):
-    cache = set()
-    page_faults = 0
-    hits = 0
-    hit_rates = []  # to track hit rate progression
+from optimal import simulate_optimal
 
-    for i, page in enumerate(trace):
-        if page in cache:
-            hits += 1
-        else:
-            page_faults += 1
-            if len(cache) < cache_size:
-                cache.add(page)
-            else:
-                # Find the page that will be used farthest in the future
-                future_uses = {p: float('inf') for p in cache}
-                for j in range(i + 1, len(trace)):
-                    if trace[j] in future_uses and future_uses[trace[j]] == float('inf'):
-                        future_uses[trace[j]] = j
-                page_to_evict = max(future_uses, key=future_uses.get)
-                cache.remove(page_to_evict)
-                cache.add(page)
-
-        # Track cumulative hit rate at this point
-        current_hit_rate = (hits / (i + 1)) * 100
-        hit_rates.append(current_hit_rate)
-
-    final_hit_rate = (hits / len(trace)) * 100
-    return page_faults, hits, final_hit_rate, hit_rates
+# Optimal Page Replacement Algorithm (Belady's MIN)
 
 
 # Example trace
@@ -53,14 +23,13 @@ if __name__ == "__main__":
     print(f"Total Hits: {total_hits}")
     print(f"Hit Rate: {hit_rate:.2f}%")
 
-    # Plot hit rate progression
-    plt.figure(figsize=(8, 4))
-    plt.plot(range(1, len(trace) + 1), hit_rate_progress,
-             marker='o', linestyle='-', color='mediumseagreen')
-    plt.title('Hit Rate Progression – Optimal Page Replacement')
-    plt.xlabel('Access Count')
-    plt.ylabel('Cumulative Hit Rate (%)')
-    plt.ylim(0, 100)
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
+    # Plot hit rate progression (see reporting.py for PLOT_OUTPUT)
+    from reporting import plot_progression
+    xs, ys = hit_rate_progress.points()
+    plot_path = plot_progression(
+        ys, xs,
+        title='Hit Rate Progression – Optimal Page Replacement',
+        xlabel='Access Count', ylabel='Cumulative Hit Rate (%)', ylim=(0, 100),
+        marker='o', linestyle='-', color='mediumseagreen')
+    if plot_path:
+        print(f"Saved plot to {plot_path}")
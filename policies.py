@@ -0,0 +1,768 @@
+"""
+Common interface for the page replacement policies.
+Every policy is constructed with the number of frames and exposes:
+    run(trace)    -> numpy bool array, True where the access was a hit
+    access(page)  -> bool, for streaming one access at a time (online policies)
+    page in policy -> bool, whether the page is resident, without touching it
+    victim()      -> the page the next miss would evict, where a policy can
+                     tell without changing state (None otherwise)
+The hot loops only record hits; counts, rates and progression curves are
+derived from the hit mask afterwards with vectorized reductions (hit_count,
+fault_count, hit_rate, hit_rate_progression). A mask can be stored compactly
+with numpy.packbits.
+"""
+import math
+import sys
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from lru_caches import lru_k
+from optimal import optimal_hits
+from taclock_page_replacement import TACClockCache
+from tinylfu import FrequencySketch
+from trace_io import load_trace
+
+
+class Policy():
+    """
+    Base class for policies. Subclasses implement access(); run() feeds a whole
+    trace through it, and offline policies override run() instead.
+    """
+    name = None
+
+    def __init__(self, frames):
+        self.frames = int(frames)
+
+    def access(self, page):
+        raise NotImplementedError(f"{type(self).__name__} cannot run online")
+
+    def __contains__(self, page):
+        raise NotImplementedError(f"{type(self).__name__} cannot run online")
+
+    def victim(self):
+        return None
+
+    def run(self, trace):
+        access = self.access
+        hits = np.zeros(len(trace), dtype=bool)
+        for start, pages in _chunks(trace):
+            hits[start:start + len(pages)] = [access(page) for page in pages]
+        return hits
+
+
+CHUNK_SIZE = 1 << 16
+
+
+def _chunks(trace, chunk_size=CHUNK_SIZE):
+    # yield (start, pages) with the pages as plain Python ints, converting
+    # memmaps and arrays one chunk at a time so a long trace is never held as
+    # a list
+    for start in range(0, len(trace), chunk_size):
+        pages = trace[start:start + chunk_size]
+        yield start, pages.tolist() if isinstance(pages, np.ndarray) else pages
+
+
+def _pages(trace):
+    # the whole trace as Python ints, for offline policies
+    return trace.tolist() if isinstance(trace, np.ndarray) else trace
+
+
+class FIFOPolicy(Policy):
+    name = "FIFO"
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self._resident = set()
+        self._queue = deque()
+
+    def __contains__(self, page):
+        return page in self._resident
+
+    def victim(self):
+        return self._queue[0] if len(self._resident) == self.frames else None
+
+    def access(self, page):
+        if page in self._resident:
+            return True
+        # If memory is full, remove the oldest page
+        if len(self._resident) == self.frames:
+            self._resident.remove(self._queue.popleft())
+        self._queue.append(page)
+        self._resident.add(page)
+        return False
+
+
+class LRUPolicy(Policy):
+    name = "LRU"
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self._cache = OrderedDict()  # least recently used first
+
+    def __contains__(self, page):
+        return page in self._cache
+
+    def victim(self):
+        return next(iter(self._cache)) if len(self._cache) >= self.frames else None
+
+    def access(self, page):
+        cache = self._cache
+        if page in cache:
+            cache.move_to_end(page)
+            return True
+        cache[page] = None
+        if len(cache) > self.frames:
+            cache.popitem(last=False)
+        return False
+
+
+class LRUKPolicy(Policy):
+    """
+    LRU-K with a correlated reference period (crp, in accesses) and a bounded
+    history for evicted pages: lru_k from lru_caches.py behind the Policy
+    interface.
+    """
+    name = "LRU-K"
+
+    def __init__(self, frames, k=2, crp=0, retained_history=0):
+        super().__init__(frames)
+        self.k = int(k)
+        self.crp = int(crp)
+        self.retained_history = int(retained_history)
+        self._cache = lru_k(size=self.frames, k=self.k, crp=self.crp,
+                            retained_history=self.retained_history)
+
+    def __contains__(self, page):
+        return page in self._cache
+
+    def access(self, page):
+        if self._cache.get(page) is not None:
+            return True
+        self._cache.set(page, True)
+        return False
+
+
+class LPRPolicy(Policy):
+    """
+    Learned LRU/MRU mix: a softmax over two Q-values picks which end of the
+    recency list to evict from, and the Q-values learn from hit/miss rewards.
+    """
+    name = "LPR"
+
+    def __init__(self, frames, alpha=0.1, beta=1.0, gamma=0.9, seed=42,
+                 rng_block=4096):
+        super().__init__(frames)
+        self.alpha = alpha  # Learning rate
+        self.beta = beta    # Softmax temperature
+        self.gamma = gamma  # Discount factor
+        self.q_values = [0.0, 0.0]  # LRU, MRU
+        self._cache = OrderedDict()  # least recently used first
+        self._rng = np.random.default_rng(seed)
+        self._rng_block = rng_block
+        self._draws = self._rng.random(rng_block).tolist()
+        self._draw_index = 0
+
+    def __contains__(self, page):
+        return page in self._cache
+
+    def access(self, page):
+        cache = self._cache
+        q = self.q_values
+        hit = page in cache
+
+        if self._draw_index == self._rng_block:
+            self._draws = self._rng.random(self._rng_block).tolist()
+            self._draw_index = 0
+        u = self._draws[self._draw_index]
+        self._draw_index += 1
+        # P(LRU) = 1 / (1 + exp(d)) with d = beta * (q_MRU - q_LRU), written
+        # as exp(-d) / (1 + exp(-d)) for d > 0 so that exp never overflows
+        d = self.beta * (q[1] - q[0])
+        if d > 0.0:
+            e = math.exp(-d)
+            policy = 0 if u * (1.0 + e) < e else 1
+        else:
+            policy = 0 if u * (1.0 + math.exp(d)) < 1.0 else 1
+
+        if hit:
+            cache.move_to_end(page)
+        else:
+            if len(cache) >= self.frames:
+                cache.popitem(last=(policy == 1))
+            cache[page] = None
+
+        reward = 1 if hit else -1
+        q[policy] += self.alpha * (reward + self.gamma * max(q) - q[policy])
+        return hit
+
+
+class TAClockPolicy(Policy):
+    """
+    TA-CLOCK: TACClockCache from taclock_page_replacement.py behind the Policy
+    interface.
+    """
+    name = "TA-CLOCK"
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self._cache = TACClockCache(self.frames)
+
+    def __contains__(self, page):
+        return page in self._cache.slots
+
+    def access(self, page):
+        return self._cache.access(page)[0] == "Hit"
+
+
+class ARCPolicy(Policy):
+    """
+    Adaptive Replacement Cache (Megiddo and Modha). T1 holds pages seen once
+    recently and T2 pages seen at least twice; the ghost lists B1 and B2 keep
+    the ids of pages recently evicted from each. A hit in a ghost list moves
+    the target size p of T1 towards the list that would have kept the page.
+    All four lists are insertion-ordered dicts, so every step is O(1) and a
+    ghost costs one hash entry.
+    """
+    name = "ARC"
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.p = 0.0  # target size of T1
+        self._t1 = OrderedDict()  # least recently used first
+        self._t2 = OrderedDict()
+        self._b1 = OrderedDict()
+        self._b2 = OrderedDict()
+
+    def __contains__(self, page):
+        return page in self._t1 or page in self._t2
+
+    def access(self, page):
+        t1, t2, b1, b2 = self._t1, self._t2, self._b1, self._b2
+        if page in t2:
+            t2.move_to_end(page)
+            return True
+        if page in t1:
+            del t1[page]
+            t2[page] = None
+            return True
+
+        c = self.frames
+        if page in b1:
+            self.p = min(c, self.p + max(len(b2) / len(b1), 1))
+            self._replace(False)
+            del b1[page]
+            t2[page] = None
+        elif page in b2:
+            self.p = max(0.0, self.p - max(len(b1) / len(b2), 1))
+            self._replace(True)
+            del b2[page]
+            t2[page] = None
+        else:
+            if len(t1) + len(b1) == c:
+                if len(t1) < c:
+                    b1.popitem(last=False)
+                    self._replace(False)
+                else:
+                    t1.popitem(last=False)
+            else:
+                total = len(t1) + len(t2) + len(b1) + len(b2)
+                if total >= c:
+                    if total == 2 * c:
+                        b2.popitem(last=False)
+                    self._replace(False)
+            t1[page] = None
+        return False
+
+    def _replace(self, in_b2):
+        t1 = self._t1
+        if t1 and (len(t1) > self.p or (in_b2 and len(t1) == self.p)):
+            victim, _ = t1.popitem(last=False)
+            self._b1[victim] = None
+        else:
+            victim, _ = self._t2.popitem(last=False)
+            self._b2[victim] = None
+
+
+class CARPolicy(Policy):
+    """
+    CLOCK with Adaptive Replacement (Bansal and Modha): ARC with T1 and T2 run
+    as clocks, so a hit only sets a reference bit. The clocks are ordered
+    dicts of page -> reference bit with the hand at the front; a referenced
+    page at the hand of T1 moves to T2, one at the hand of T2 goes round again.
+    """
+    name = "CAR"
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.p = 0.0  # target size of T1
+        self._t1 = OrderedDict()
+        self._t2 = OrderedDict()
+        self._b1 = OrderedDict()  # least recently evicted first
+        self._b2 = OrderedDict()
+
+    def __contains__(self, page):
+        return page in self._t1 or page in self._t2
+
+    def access(self, page):
+        t1, t2, b1, b2 = self._t1, self._t2, self._b1, self._b2
+        if page in t1:
+            t1[page] = 1
+            return True
+        if page in t2:
+            t2[page] = 1
+            return True
+
+        c = self.frames
+        in_b1 = page in b1
+        in_b2 = not in_b1 and page in b2
+        if len(t1) + len(t2) == c:
+            self._replace()
+            if not (in_b1 or in_b2):
+                if len(t1) + len(b1) == c:
+                    b1.popitem(last=False)
+                elif len(t1) + len(t2) + len(b1) + len(b2) == 2 * c:
+                    b2.popitem(last=False)
+
+        if in_b1:
+            self.p = min(self.p + max(1, len(b2) / len(b1)), c)
+            del b1[page]
+            t2[page] = 0
+        elif in_b2:
+            self.p = max(self.p - max(1, len(b1) / len(b2)), 0.0)
+            del b2[page]
+            t2[page] = 0
+        else:
+            t1[page] = 0
+        return False
+
+    def _replace(self):
+        t1, t2 = self._t1, self._t2
+        while True:
+            if len(t1) >= max(1, self.p):
+                page, referenced = t1.popitem(last=False)
+                if not referenced:
+                    self._b1[page] = None
+                    return
+                t2[page] = 0
+            else:
+                page, referenced = t2.popitem(last=False)
+                if not referenced:
+                    self._b2[page] = None
+                    return
+                t2[page] = 0
+
+
+class LIRSPolicy(Policy):
+    """
+    Low Inter-reference Recency Set (Jiang and Zhang). Pages with a short
+    reuse distance (LIR) hold most frames; the rest (hir_ratio of them) form
+    a small FIFO queue Q of resident HIR pages, so a scan only churns Q. The
+    recency stack S also remembers non-resident HIR pages, which become LIR
+    if they come back while still in S; at most nonresident_ratio * frames of
+    them are kept, dropping the one evicted longest ago first.
+    """
+    name = "LIRS"
+
+    LIR, HIR, NONRESIDENT = 0, 1, 2
+
+    def __init__(self, frames, hir_ratio=0.01, nonresident_ratio=2.0):
+        super().__init__(frames)
+        self.lir_frames = max(1, self.frames - max(1, int(self.frames * hir_ratio)))
+        self.hir_frames = self.frames - self.lir_frames
+        self.nonresident_limit = max(1, int(self.frames * nonresident_ratio))
+        self._status = {}
+        self._stack = OrderedDict()  # S, bottom (least recent) first
+        self._queue = OrderedDict()  # resident HIR pages, oldest first
+        self._nonresident = OrderedDict()  # non-resident pages in S, by eviction
+        self._lir_count = 0
+
+    def __contains__(self, page):
+        status = self._status.get(page)
+        return status == self.LIR or status == self.HIR
+
+    def access(self, page):
+        status = self._status.get(page)
+        stack = self._stack
+        if status == self.LIR:
+            stack.move_to_end(page)
+            self._prune()
+            return True
+        if status == self.HIR:
+            if page in stack:
+                stack.move_to_end(page)
+                del self._queue[page]
+                self._status[page] = self.LIR
+                self._lir_count += 1
+                self._balance()
+            else:
+                stack[page] = None
+                self._queue.move_to_end(page)
+            return True
+
+        if self._lir_count + len(self._queue) >= self.frames:
+            self._evict()
+        # eviction may have dropped the page's own non-resident entry
+        if self._status.get(page) == self.NONRESIDENT:
+            # still in S: its reuse distance beats the oldest LIR page
+            del self._nonresident[page]
+            stack.move_to_end(page)
+            self._status[page] = self.LIR
+            self._lir_count += 1
+            self._balance()
+        elif self._lir_count < self.lir_frames:
+            stack[page] = None
+            self._status[page] = self.LIR
+            self._lir_count += 1
+        else:
+            stack[page] = None
+            self._queue[page] = None
+            self._status[page] = self.HIR
+        return False
+
+    def _balance(self):
+        # while there are too many LIR pages, the bottom LIR page of S becomes
+        # a resident HIR page at the end of Q
+        while self._lir_count > self.lir_frames:
+            self._demote_bottom()
+        self._prune()
+
+    def _demote_bottom(self):
+        self._prune()
+        bottom, _ = self._stack.popitem(last=False)
+        self._status[bottom] = self.HIR
+        self._queue[bottom] = None
+        self._lir_count -= 1
+
+    def _prune(self):
+        # keep a LIR page at the bottom of S
+        stack = self._stack
+        status = self._status
+        while stack:
+            bottom = next(iter(stack))
+            if status[bottom] == self.LIR:
+                return
+            del stack[bottom]
+            if status[bottom] == self.NONRESIDENT:
+                del status[bottom]
+                del self._nonresident[bottom]
+
+    def _evict(self):
+        if not self._queue:
+            # every resident page is LIR (no HIR frames at this size)
+            self._demote_bottom()
+        victim, _ = self._queue.popitem(last=False)
+        if victim not in self._stack:
+            del self._status[victim]
+            return
+        self._status[victim] = self.NONRESIDENT
+        self._nonresident[victim] = None
+        if len(self._nonresident) > self.nonresident_limit:
+            oldest, _ = self._nonresident.popitem(last=False)
+            del self._stack[oldest]
+            del self._status[oldest]
+            self._prune()
+
+
+class ClockProPolicy(Policy):
+    """
+    CLOCK-Pro (Jiang, Chen and Zhang): LIRS-like hot/cold classification at
+    CLOCK cost. A hit only sets a reference bit. New pages start cold in a
+    test period. The cold hand promotes referenced cold pages in their test
+    period to hot, gives referenced ones outside it (pages demoted from hot) a
+    new test period as cold pages, and evicts unreferenced ones, keeping the
+    ids of those in their test period as non-resident pages; the hot hand
+    demotes unreferenced hot pages, without a test period, while there are
+    more than frames - cold_target of them. A reference during a test period,
+    to a resident cold page or a non-resident one (which comes back hot),
+    grows cold_target; a test period that runs out shrinks it.
+    Deviations from the paper:
+        - every class has its own ring (an ordered dict with the hand at the
+          front) instead of one list shared by three hands, so a hand never
+          walks over pages of another class and each step is amortized O(1)
+        - test periods do not end when the hot hand passes the page: a
+          resident page's lasts until the cold hand reaches it, and
+          non-resident ones end oldest first once more than frames of them
+          are kept
+    """
+    name = "CLOCK-Pro"
+    REFERENCED = 1
+    TESTING = 2
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.cold_target = self.frames
+        self._hot = OrderedDict()  # page -> reference bit, hot hand first
+        # page -> REFERENCED | TESTING flags, cold hand first
+        self._cold = OrderedDict()
+        self._test = OrderedDict()  # non-resident pages, oldest first
+
+    def __contains__(self, page):
+        return page in self._hot or page in self._cold
+
+    def access(self, page):
+        if page in self._hot:
+            self._hot[page] = 1
+            return True
+        flags = self._cold.get(page)
+        if flags is not None:
+            if not flags & self.REFERENCED:
+                if flags & self.TESTING and self.cold_target < self.frames:
+                    self.cold_target += 1
+                self._cold[page] = flags | self.REFERENCED
+            return True
+
+        while len(self._hot) + len(self._cold) >= self.frames:
+            self._run_hand_cold()
+        if page in self._test:
+            del self._test[page]
+            if self.cold_target < self.frames:
+                self.cold_target += 1
+            self._hot[page] = 0
+            self._balance()
+        else:
+            self._cold[page] = self.TESTING
+        return False
+
+    def _run_hand_cold(self):
+        if not self._cold:
+            self._run_hand_hot()
+            return
+        page, flags = self._cold.popitem(last=False)
+        if flags & self.REFERENCED:
+            if flags & self.TESTING:
+                self._hot[page] = 0
+                self._balance()
+            else:
+                self._cold[page] = self.TESTING
+            return
+        if flags & self.TESTING:
+            self._test[page] = None
+            if len(self._test) > self.frames:
+                # the oldest test period runs out
+                self._test.popitem(last=False)
+                if self.cold_target > 1:
+                    self.cold_target -= 1
+
+    def _balance(self):
+        while len(self._hot) > self.frames - self.cold_target:
+            self._run_hand_hot()
+
+    def _run_hand_hot(self):
+        page, referenced = self._hot.popitem(last=False)
+        if referenced:
+            self._hot[page] = 0
+        else:
+            self._cold[page] = 0
+
+
+class LFUPolicy(Policy):
+    """
+    LFU with O(1) access and eviction: pages sit in buckets by key, an
+    ordered dict per key with the least recently used page first, and a lower
+    bound of the smallest key is kept, so a hit moves a page to a higher
+    bucket and the victim is the front of the lowest bucket. Keys never have
+    to be compared or scanned. Without aging the key is the reference count.
+    Plain LFU keeps pages that were popular once forever. Two kinds of aging
+    let it follow phase changes:
+        "decay"    every period accesses (10 * frames by default) all counts
+                   are halved, amortized O(1) per access
+        "dynamic"  LFU-DA (Arlitt et al.): the key of a page is L + its
+                   reference count, recomputed on every reference, where the
+                   cache age L is the key of the last victim, so pages that
+                   stop being referenced fall behind as the cache turns over
+    With "dynamic" keys can jump by more than one, and the lowest non-empty
+    bucket is found by stepping the bound up from the previous one; keys
+    never drop below the bound, so the steps are amortized O(1) per access.
+    """
+    name = "LFU"
+    AGING = (None, "decay", "dynamic")
+
+    def __init__(self, frames, aging=None, period=None):
+        super().__init__(frames)
+        if aging not in self.AGING:
+            raise ValueError(f"unknown aging {aging!r}, expected one of "
+                             f"{', '.join(map(str, self.AGING))}")
+        self.aging = aging
+        self.period = int(period) if period else 10 * self.frames
+        self._key = {}  # page -> bucket key, _age + count
+        self._count = {}  # page -> reference count
+        self._buckets = {}  # key -> OrderedDict of pages, LRU first
+        self._min = 0  # no bucket below this key
+        self._age = 0  # key of the last victim, for "dynamic"
+        self._accesses = 0
+
+    def __contains__(self, page):
+        return page in self._key
+
+    def victim(self):
+        if len(self._key) < self.frames:
+            return None
+        return next(iter(self._buckets[self._lowest()]))
+
+    def access(self, page):
+        if self.aging == "decay":
+            self._accesses += 1
+            if self._accesses >= self.period:
+                self._decay()
+        key = self._key.get(page)
+        if key is not None:
+            bucket = self._buckets[key]
+            del bucket[page]
+            if not bucket:
+                del self._buckets[key]
+                if self._min == key:
+                    self._min = key + 1
+            count = self._count[page] + 1
+            self._add(page, self._age + count, count)
+            return True
+
+        if len(self._key) >= self.frames:
+            lowest = self._lowest()
+            bucket = self._buckets[lowest]
+            victim, _ = bucket.popitem(last=False)
+            del self._key[victim]
+            del self._count[victim]
+            if not bucket:
+                del self._buckets[lowest]
+            if self.aging == "dynamic":
+                self._age = lowest
+        # resident keys are all >= _age, so the new page holds the lowest key
+        # unless a page at _age is left
+        key = self._age + 1
+        self._add(page, key, 1)
+        if self._min not in self._buckets or key < self._min:
+            self._min = key
+        return False
+
+    def _lowest(self):
+        buckets = self._buckets
+        while self._min not in buckets:
+            self._min += 1
+        return self._min
+
+    def _add(self, page, key, count):
+        self._key[page] = key
+        self._count[page] = count
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = OrderedDict()
+        bucket[page] = None
+
+    def _decay(self):
+        # rebuild the buckets with halved counts, merging pairs of buckets
+        # (the order inside a merged bucket is only roughly by recency)
+        self._accesses = 0
+        buckets = self._buckets
+        self._buckets = {}
+        for key in sorted(buckets):
+            for page in buckets[key]:
+                count = max(1, self._count[page] >> 1)
+                self._add(page, count, count)
+        self._min = min(self._buckets) if self._buckets else 0
+
+
+class TinyLFUPolicy(Policy):
+    """
+    W-TinyLFU admission (Einziger, Friedman and Manes) in front of another
+    policy. New pages enter a small LRU window (window_ratio of the frames).
+    A page leaving the window only enters the main policy, which has the
+    other frames, if the frequency sketch rates it above the page main would
+    evict, or, for policies whose victim() cannot tell, if it has been seen
+    at least min_frequency times, so one-hit wonders never displace anything.
+    Frequencies come from tinylfu.FrequencySketch, a few bytes per frame.
+    Extra keyword arguments go to the main policy.
+    """
+    name = "W-TinyLFU"
+
+    def __init__(self, frames, policy="LRU", window_ratio=0.01,
+                 sample_factor=10, min_frequency=2, **policy_args):
+        super().__init__(frames)
+        self.window_frames = (max(1, int(self.frames * window_ratio))
+                              if self.frames > 1 else 0)
+        policy_class = POLICIES[policy] if isinstance(policy, str) else policy
+        self.main = policy_class(self.frames - self.window_frames, **policy_args)
+        self.min_frequency = min_frequency
+        self.sketch = FrequencySketch(self.frames, sample_factor)
+        self._window = OrderedDict()  # least recently used first
+        self._admitted = 0
+
+    def __contains__(self, page):
+        return page in self._window or page in self.main
+
+    def access(self, page):
+        self.sketch.record(page)
+        window = self._window
+        if page in window:
+            window.move_to_end(page)
+            return True
+        main = self.main
+        if page in main:
+            return main.access(page)
+        window[page] = None
+        if len(window) > self.window_frames:
+            candidate, _ = window.popitem(last=False)
+            if self._admit(candidate):
+                main.access(candidate)
+        return False
+
+    def _admit(self, candidate):
+        # main only evicts once full, and only admitted pages ever enter it
+        if self._admitted < self.main.frames:
+            self._admitted += 1
+            return True
+        frequency = self.sketch.frequency(candidate)
+        victim = self.main.victim()
+        if victim is None:
+            return frequency >= self.min_frequency
+        return frequency > self.sketch.frequency(victim)
+
+
+class OPTPolicy(Policy):
+    """
+    Belady's OPT (see optimal.py). It needs the future, so it only supports
+    run().
+    """
+    name = "OPT"
+
+    def run(self, trace):
+        return optimal_hits(_pages(trace), self.frames)
+
+
+POLICIES = {
+    policy.name: policy
+    for policy in (FIFOPolicy, LRUPolicy, LRUKPolicy, LPRPolicy, TAClockPolicy,
+                   ARCPolicy, CARPolicy, LIRSPolicy, ClockProPolicy, LFUPolicy,
+                   TinyLFUPolicy, OPTPolicy)
+}
+
+
+def hit_count(mask):
+    return int(np.count_nonzero(mask))
+
+
+def fault_count(mask):
+    return len(mask) - hit_count(mask)
+
+
+def hit_rate(mask):
+    return hit_count(mask) / len(mask) if len(mask) else 0.0
+
+
+def hit_rate_progression(mask):
+    # cumulative hit rate after every access
+    return np.cumsum(mask) / np.arange(1, len(mask) + 1)
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "data.txt"
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    trace = load_trace(path, length=10000)
+    print(f"Access Trace Size: {len(trace)}")
+    print(f"Frames: {frames}")
+    print(f"{'Policy':>10} {'Hits':>8} {'Faults':>8} {'Hit Rate':>9}")
+    for name, policy in POLICIES.items():
+        mask = policy(frames).run(trace)
+        print(f"{name:>10} {hit_count(mask):>8} {fault_count(mask):>8} "
+              f"{hit_rate(mask) * 100:>8.2f}%")
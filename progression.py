@@ -0,0 +1,204 @@
+"""
+Constant-memory hit rate progression.
+Recording the hit rate after every access costs one Python float per access,
+which on long traces is gigabytes. ProgressionRecorder keeps a bounded number
+of points instead, chosen by one of three methods:
+    "stride"     every s-th point; s doubles (dropping every other kept point)
+                 whenever 2 * max_points have been kept
+    "reservoir"  a uniform random sample of max_points points (Algorithm L)
+    "lttb"       the low and high point of every bucket of accesses,
+                 compacted with Largest-Triangle-Three-Buckets downsampling
+                 whenever 2 * max_points are kept, which keeps the peaks and
+                 dips a plot needs
+Each recorded value is the cumulative hit rate, or with window=w the hit rate
+over the last w accesses, maintained with O(1) updates and O(w) memory.
+Memory never depends on the length of the trace.
+"""
+import math
+import random
+from collections import deque
+
+METHODS = ("stride", "reservoir", "lttb")
+
+
+def lttb(xs, ys, threshold):
+    """
+    Downsample a series to threshold points with Largest-Triangle-Three-Buckets.
+    The first and last points are always kept. Returns (xs, ys) as lists.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(xs), list(ys)
+    out_x = [xs[0]]
+    out_y = [ys[0]]
+    bucket = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # average of the next bucket is the third corner of the triangle
+        start = int((i + 1) * bucket) + 1
+        end = min(int((i + 2) * bucket) + 1, n)
+        avg_x = sum(xs[start:end]) / (end - start)
+        avg_y = sum(ys[start:end]) / (end - start)
+
+        ax = xs[a]
+        ay = ys[a]
+        best = -1.0
+        chosen = start
+        for j in range(int(i * bucket) + 1, start):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best:
+                best = area
+                chosen = j
+        out_x.append(xs[chosen])
+        out_y.append(ys[chosen])
+        a = chosen
+    out_x.append(xs[-1])
+    out_y.append(ys[-1])
+    return out_x, out_y
+
+
+class ProgressionRecorder():
+    def __init__(self, max_points=1000, method="stride", window=None,
+                 scale=1.0, seed=0):
+        """
+        Record a hit rate progression in bounded memory.
+        Parameters:
+            max_points: int
+                Points kept ("stride" and "lttb" may hold up to twice as many
+                between compactions).
+            method: "stride", "reservoir" or "lttb"
+            window: int (optional)
+                Record the hit rate over the last window accesses instead of
+                the cumulative one.
+            scale: float
+                Multiplier of the recorded rates, e.g. 100 for percentages.
+            seed: int
+                Seed of the reservoir sample.
+        """
+        if method not in METHODS:
+            raise ValueError(f"unknown method {method!r}, expected one of "
+                             f"{', '.join(METHODS)}")
+        if max_points < 3:
+            raise ValueError("max_points must be at least 3")
+        if window is not None and window < 1:
+            raise ValueError("window must be positive")
+        self.max_points = int(max_points)
+        self.method = method
+        self.window = window
+        self.scale = scale
+        self.count = 0
+        self.hits = 0
+        self._recent = deque()
+        self._window_hits = 0
+        self._xs = []
+        self._ys = []
+        self._last = None
+        self._stride = 1
+        self._span = 2
+        self._low = self._high = None
+        self._rng = random.Random(seed)
+        self._add = getattr(self, "_add_" + method)
+        if method == "reservoir":
+            self._weight = 1.0
+            self._next = self.max_points
+            self._skip()
+
+    def record(self, hit):
+        """Record one access, a hit if hit is true."""
+        self.count += 1
+        if hit:
+            self.hits += 1
+        if self.window is None:
+            value = self.hits / self.count
+        else:
+            recent = self._recent
+            recent.append(hit)
+            if hit:
+                self._window_hits += 1
+            if len(recent) > self.window and recent.popleft():
+                self._window_hits -= 1
+            value = self._window_hits / len(recent)
+        self._add(self.count, value * self.scale)
+
+    def record_many(self, hits):
+        record = self.record
+        for hit in hits:
+            record(hit)
+
+    @property
+    def hit_rate(self):
+        # cumulative hit rate over everything recorded, unscaled
+        return self.hits / self.count if self.count else 0.0
+
+    def points(self):
+        """
+        Return (xs, ys): the kept points in access order, x being the 1-based
+        access number, always ending with the latest access.
+        """
+        if self.method == "reservoir":
+            pairs = sorted(zip(self._xs, self._ys))
+            xs = [x for x, _ in pairs]
+            ys = [y for _, y in pairs]
+        elif self.method == "lttb":
+            pending = [] if self._low is None else sorted({self._low, self._high})
+            xs = self._xs + [x for x, _ in pending]
+            ys = self._ys + [y for _, y in pending]
+            xs, ys = lttb(xs, ys, self.max_points)
+        else:
+            xs = list(self._xs)
+            ys = list(self._ys)
+        if self._last is not None and (not xs or xs[-1] != self._last[0]):
+            xs.append(self._last[0])
+            ys.append(self._last[1])
+        return xs, ys
+
+    def _add_stride(self, x, y):
+        self._last = (x, y)
+        if (x - 1) % self._stride:
+            return
+        self._xs.append(x)
+        self._ys.append(y)
+        if len(self._xs) >= 2 * self.max_points:
+            del self._xs[1::2]
+            del self._ys[1::2]
+            self._stride *= 2
+
+    def _add_lttb(self, x, y):
+        # keep the lowest and highest point of every bucket of span accesses;
+        # the span doubles whenever the buffer is halved, so the density of
+        # kept points stays the same along the whole curve
+        self._last = (x, y)
+        if self._low is None or y < self._low[1]:
+            self._low = (x, y)
+        if self._high is None or y > self._high[1]:
+            self._high = (x, y)
+        if x % self._span:
+            return
+        for point in sorted({self._low, self._high}):
+            self._xs.append(point[0])
+            self._ys.append(point[1])
+        self._low = self._high = None
+        if len(self._xs) >= 2 * self.max_points:
+            self._xs, self._ys = lttb(self._xs, self._ys, self.max_points)
+            self._span *= 2
+
+    def _add_reservoir(self, x, y):
+        self._last = (x, y)
+        if len(self._xs) < self.max_points:
+            self._xs.append(x)
+            self._ys.append(y)
+        elif x == self._next:
+            slot = self._rng.randrange(self.max_points)
+            self._xs[slot] = x
+            self._ys[slot] = y
+            self._skip()
+
+    def _skip(self):
+        # Algorithm L: jump straight to the next point that enters the sample
+        rng = self._rng
+        self._weight *= math.exp(math.log(1.0 - rng.random()) / self.max_points)
+        if self._weight >= 1.0:
+            self._next += 1
+            return
+        gap = math.log(1.0 - rng.random()) / math.log(1.0 - self._weight)
+        self._next += int(gap) + 1
@@ -0,0 +1,90 @@
+"""
+Optional plotting for the simulation scripts.
+matplotlib is only imported when a plot is actually drawn, so simulations that
+do not plot start without paying for it. Where the plot goes is controlled by
+the PLOT_OUTPUT environment variable:
+    unset        show the figure in a window (the scripts' old behaviour)
+    none / off   skip plotting entirely; matplotlib is never imported
+    <directory>  render with the non-interactive Agg backend and save the
+                 figure there as PNG, which never blocks batch runs
+"""
+import os
+import re
+
+PLOT_OUTPUT = "PLOT_OUTPUT"
+_DISABLED = ("", "0", "none", "off", "false", "no")
+
+
+def plot_target():
+    """
+    Return None when plotting is disabled, "show" for an interactive window,
+    or the directory figures should be saved to.
+    """
+    target = os.environ.get(PLOT_OUTPUT)
+    if target is None:
+        return "show"
+    if target.strip().lower() in _DISABLED:
+        return None
+    return target
+
+
+def _pyplot(headless):
+    import matplotlib
+    if headless:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _file_name(title):
+    slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+    return (slug or "plot") + ".png"
+
+
+def plot_progression(y, x=None, title="", xlabel="", ylabel="", ylim=None,
+                     label=None, figsize=(8, 4), file_name=None, **style):
+    """
+    Plot a hit rate progression (or any series) as a line chart.
+    Parameters:
+        y: sequence of float
+        x: sequence (optional)
+            Positions of the points, by default 0..len(y)-1.
+        title, xlabel, ylabel: str
+        ylim: (low, high) (optional)
+        label: str (optional)
+            Legend entry; no legend is drawn without it.
+        figsize: (width, height) in inches
+        file_name: str (optional)
+            Name of the saved file, derived from the title by default.
+        **style:
+            Passed on to pyplot.plot, e.g. marker, linestyle, color.
+    Returns the path of the saved figure, or None if it was shown or skipped.
+    """
+    target = plot_target()
+    if target is None:
+        return None
+    plt = _pyplot(headless=target != "show")
+
+    fig = plt.figure(figsize=figsize)
+    if x is None:
+        plt.plot(y, label=label, **style)
+    else:
+        plt.plot(x, y, label=label, **style)
+    plt.title(title)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+    if ylim is not None:
+        plt.ylim(*ylim)
+    plt.grid(True)
+    if label is not None:
+        plt.legend()
+    plt.tight_layout()
+
+    if target == "show":
+        plt.show()
+        return None
+    os.makedirs(target, exist_ok=True)
+    path = os.path.join(target, file_name or _file_name(title))
+    fig.savefig(path)
+    plt.close(fig)
+    return path
@@ -0,0 +1,234 @@
+"""
+Approximate miss-ratio curves by spatially hashed sampling (SHARDS, Waldspurger
+et al., FAST 2015).
+A page is kept iff hash(page) mod P < T, so every reference to a sampled page
+is kept and none of the others are: the sample is a trace over a fraction
+R = T / P of the pages. A cache of C frames on the full trace behaves like a
+cache of C * R frames on the sample, so
+    LRU       stack distances of the sample, scaled by 1 / R, give the whole
+              curve from one pass (see stack_distance.py)
+    FIFO      and any other policy run exactly on the sample, with every
+              frame count scaled by R
+Sampling is a vectorized pass over the memory-mapped trace, and everything
+after it touches only about R of the references and R of the distinct pages,
+so R = 0.01 .. 0.001 cuts time and memory by 100 .. 1000x. The error shrinks
+with the number of distinct pages in the sample and grows with how much of the
+trace a few hot pages carry, since each of them is either sampled with all its
+references or not at all. The SHARDS-adj correction (adjust=True, the
+default) counts the difference between the expected (N * R) and actual sample
+sizes as hits at the smallest stack distance, i.e. misses are divided by the
+expected sample size, which largely cancels that effect. shards_estimate
+averages independent samples (one per seed) and reports their standard error,
+which both reduces the error and bounds it. Use the exact engines for final
+numbers.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from policies import POLICIES
+from stack_distance import fifo_hits, hit_curve, lru_hit_curve, lru_stack_distances
+from trace_io import load_trace
+
+MODULUS_BITS = 24
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_GOLDEN = 0x9E3779B97F4A7C15
+
+
+def page_hash(pages, seed=0):
+    """
+    Hash page ids to uniform values in [0, 2**MODULUS_BITS) with the
+    splitmix64 finalizer; different seeds give independent samples.
+    """
+    h = np.asarray(pages).astype(np.uint64)
+    h += np.uint64((_GOLDEN * (seed + 1)) & 0xFFFFFFFFFFFFFFFF)
+    h ^= h >> np.uint64(30)
+    h *= _MIX_1
+    h ^= h >> np.uint64(27)
+    h *= _MIX_2
+    h ^= h >> np.uint64(31)
+    return h >> np.uint64(64 - MODULUS_BITS)
+
+
+def _threshold(rate):
+    if not 0 < rate <= 1:
+        raise ValueError("rate must be in (0, 1]")
+    return max(1, int(round(rate * (1 << MODULUS_BITS))))
+
+
+def shards_sample(trace, rate, seed=0, chunk_size=1 << 22):
+    """
+    Return the references of the trace whose page hashes under the threshold,
+    in order, reading the trace chunk by chunk.
+    The effective rate is threshold / 2**MODULUS_BITS, see sample_rate.
+    """
+    threshold = np.uint64(_threshold(rate))
+    trace = np.asarray(trace)
+    kept = []
+    for start in range(0, len(trace), chunk_size):
+        chunk = np.asarray(trace[start:start + chunk_size])
+        kept.append(chunk[page_hash(chunk, seed) < threshold])
+    if not kept:
+        return np.zeros(0, dtype=trace.dtype)
+    return np.concatenate(kept)
+
+
+def sample_rate(rate):
+    # the rate actually applied after rounding the threshold
+    return _threshold(rate) / (1 << MODULUS_BITS)
+
+
+def _scaled_frames(frame_sizes, rate):
+    return [max(1, int(round(frames * rate))) for frames in frame_sizes]
+
+
+def shards_lru_miss_ratios(trace, frame_sizes, rate=0.01, seed=0, adjust=True,
+                           sample=None):
+    """
+    Approximate LRU miss ratios for each of the requested frame counts.
+    Parameters:
+        trace: array or sequence of page ids
+        frame_sizes: list of int
+        rate: float
+            Fraction of the pages to sample.
+        seed: int
+        adjust: bool
+            Apply the SHARDS-adj correction.
+        sample: array (optional)
+            A sample already taken with shards_sample(trace, rate, seed).
+    Returns:
+        A list with the miss ratio for every entry of frame_sizes, in order.
+    """
+    rate_used = sample_rate(rate)
+    if sample is None:
+        sample = shards_sample(trace, rate, seed)
+    sampled = len(sample)
+    expected = len(trace) * rate_used if adjust else sampled
+    if expected == 0:
+        return [1.0] * len(frame_sizes)
+    distances = lru_stack_distances(sample.tolist())
+    hits = hit_curve(distances)
+    # hits[c] is for c sampled frames, i.e. c / R frames of the full trace;
+    # interpolate between those points
+    scaled = np.arange(len(hits)) / rate_used
+    sample_hits = np.interp(frame_sizes, scaled, hits)
+    misses = sampled - sample_hits
+    return np.clip(misses / expected, 0.0, 1.0).tolist()
+
+
+def shards_miss_ratios(trace, frame_sizes, policy="LRU", rate=0.01, seed=0,
+                       sample=None, adjust=True):
+    """
+    Approximate miss ratios of any policy in policies.POLICIES for each of the
+    requested frame counts. LRU comes from sampled stack distances, FIFO from
+    the multi-capacity pass of stack_distance.fifo_hits, and other policies
+    run once per frame count on the sample with the frame count scaled by R.
+    adjust applies the SHARDS-adj correction as for LRU.
+    """
+    if policy == "LRU":
+        return shards_lru_miss_ratios(trace, frame_sizes, rate, seed, adjust,
+                                      sample)
+    if policy not in POLICIES:
+        raise ValueError(f"unknown policy {policy!r}, "
+                         f"expected one of {', '.join(POLICIES)}")
+    if sample is None:
+        sample = shards_sample(trace, rate, seed)
+    rate_used = sample_rate(rate)
+    expected = len(trace) * rate_used if adjust else len(sample)
+    if len(sample) == 0 or expected == 0:
+        return [1.0] * len(frame_sizes)
+    frames = _scaled_frames(frame_sizes, rate_used)
+    if policy == "FIFO":
+        hits = fifo_hits(sample.tolist(), frames)
+    else:
+        hits = [int(np.count_nonzero(POLICIES[policy](f).run(sample)))
+                for f in frames]
+    return [min(max((len(sample) - h) / expected, 0.0), 1.0) for h in hits]
+
+
+def shards_estimate(trace, frame_sizes, policies=("LRU",), rate=0.01,
+                    seeds=(0, 1, 2, 3)):
+    """
+    Average the sampled miss ratios over one independent sample per seed.
+    Every sample is taken once and shared by all policies.
+    Returns:
+        {policy: (mean, stderr)} with a list of floats per frame count each;
+        stderr is the standard error of the mean, 0 with a single seed.
+    """
+    curves = {policy: [] for policy in policies}
+    for seed in seeds:
+        sample = shards_sample(trace, rate, seed)
+        for policy in policies:
+            curves[policy].append(shards_miss_ratios(
+                trace, frame_sizes, policy, rate, seed, sample))
+    estimates = {}
+    for policy, runs in curves.items():
+        runs = np.array(runs)
+        mean = runs.mean(axis=0)
+        if len(runs) > 1:
+            stderr = runs.std(axis=0, ddof=1) / np.sqrt(len(runs))
+        else:
+            stderr = np.zeros_like(mean)
+        estimates[policy] = (mean.tolist(), stderr.tolist())
+    return estimates
+
+
+def _float_list(text):
+    return [float(x) for x in text.split(",") if x]
+
+
+def _int_list(text):
+    return [int(x) for x in text.split(",") if x]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sampled miss-ratio curves.")
+    parser.add_argument("trace", nargs="?", default="data.txt")
+    parser.add_argument("--rate", type=float, default=0.01)
+    parser.add_argument("--seeds", type=_int_list, default=[0, 1, 2, 3],
+                        help="one independent sample per seed")
+    parser.add_argument("--policies", default="FIFO,LRU,TA-CLOCK",
+                        help="comma separated policy names")
+    parser.add_argument("--frames", type=_float_list,
+                        default=[1e2, 5e2, 1e3, 2e3, 5e3, 1e4, 5e4])
+    parser.add_argument("--exact", action="store_true",
+                        help="also compute the exact LRU curve for comparison")
+    args = parser.parse_args()
+
+    trace = load_trace(args.trace)
+    frame_sizes = [int(f) for f in args.frames]
+    policies = args.policies.split(",")
+    t = time.perf_counter()
+    estimates = shards_estimate(trace, frame_sizes, policies, args.rate,
+                                args.seeds)
+    elapsed = time.perf_counter() - t
+    print(f"Access Trace Size: {len(trace)}")
+    print(f"Sampling Rate: {sample_rate(args.rate):.5f}, "
+          f"{len(args.seeds)} sample(s)")
+    print(f"Sampled in {elapsed:.3f} seconds", file=sys.stderr)
+
+    exact = None
+    if args.exact:
+        t = time.perf_counter()
+        hits = lru_hit_curve(trace.tolist())
+        exact = [1.0 - hits[min(f, len(hits) - 1)] / len(trace)
+                 for f in frame_sizes]
+        print(f"Exact LRU in {time.perf_counter() - t:.3f} seconds",
+              file=sys.stderr)
+
+    print("Miss ratios (mean +- standard error)")
+    header = f"{'Frames':>8}" + "".join(f" {p:>16}" for p in policies)
+    if exact is not None:
+        header += f" {'LRU exact':>10}"
+    print(header)
+    for i, frames in enumerate(frame_sizes):
+        line = f"{frames:>8}"
+        for policy in policies:
+            mean, stderr = estimates[policy]
+            line += f" {mean[i] * 100:>7.2f}% +-{stderr[i] * 100:>5.2f}"
+        if exact is not None:
+            line += f" {exact[i] * 100:>9.2f}%"
+        print(line)
@@ -0,0 +1,276 @@
+"""
+Single-pass miss-ratio curves using stack distances (Mattson et al.).
+LRU is a stack algorithm: the contents of a cache of c frames are always the
+c most recently used pages, so a reference hits in every cache whose size is at
+least its stack distance (the number of distinct pages touched since the last
+reference to the same page, itself included). Computing that distance for every
+reference once gives the hit count for every frame count at the same time.
+Distances are counted with a Fenwick tree over access positions, where each page
+keeps a single mark at the position of its latest reference, so the whole pass
+is O(n log n).
+Belady's OPT (MIN) is a stack algorithm as well, with the priority of a page
+being its next reference. Its stack is maintained with Mattson's priority update,
+which walks down from the top keeping the page that is needed sooner at each
+level, so one pass yields the optimal hit count for every frame count. That
+walk costs up to the depth of the stack per reference, O(n * U) for U distinct
+pages, or O(n * max_size) when only the top max_size levels are kept: fine for
+curves over thousands of frames, out of reach for multi-million-access traces
+over many pages, where simulating OPT per size
+(optimal.simulate_optimal, O(n log c)) is the way.
+FIFO is not a stack algorithm, so it gets no such shortcut: fifo_hits runs one
+FIFO per capacity, but all of them over a single read of the trace, chunk by
+chunk, each as a ring buffer of its c pages and a set of the same pages.
+"""
+import sys
+
+import numpy as np
+
+from optimal import compute_next_use
+from trace_io import load_trace
+
+# accesses converted to Python ints at a time by fifo_hits
+FIFO_CHUNK = 1 << 16
+
+
+class _Fenwick():
+    def __init__(self, size):
+        self._size = size
+        self._tree = [0] * (size + 1)
+
+    def add(self, index, delta):
+        # index is 0-based
+        i = index + 1
+        tree = self._tree
+        size = self._size
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, index):
+        # sum of positions 0..index inclusive
+        i = index + 1
+        tree = self._tree
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+
+def lru_stack_distances(trace):
+    """
+    Parameters:
+        trace: sequence of hashable page ids
+    Returns:
+        A list with the LRU stack distance of every reference, 0 for cold misses.
+    """
+    n = len(trace)
+    marks = _Fenwick(n)
+    last_seen = {}
+    distances = [0] * n
+    for i, page in enumerate(trace):
+        p = last_seen.get(page)
+        if p is not None:
+            # distinct pages referenced after p, plus the page itself
+            distances[i] = marks.prefix(i - 1) - marks.prefix(p) + 1
+            marks.add(p, -1)
+        marks.add(i, 1)
+        last_seen[page] = i
+    return distances
+
+
+def opt_stack_distances(trace, max_size=None):
+    """
+    Parameters:
+        trace: sequence of hashable page ids
+        max_size: int (optional)
+            Only track the top max_size levels of the stack. Deeper references
+            are reported as misses, which is exact for every cache up to that size.
+    Returns:
+        A list with the OPT stack distance of every reference, 0 for misses.
+    Every miss walks the stack, so this is O(n * min(U, max_size)) for U
+    distinct pages; pass the largest frame count of interest as max_size.
+    """
+    next_use = compute_next_use(trace)
+    stack = []
+    priority = {}  # page -> index of its next reference
+    distances = [0] * len(trace)
+    for i, page in enumerate(trace):
+        if stack and stack[0] == page:
+            distances[i] = 1
+        else:
+            # the referenced page goes on top and the old top is carried down;
+            # at each level the page needed sooner stays, the other moves on
+            carry = stack[0] if stack else None
+            if stack:
+                stack[0] = page
+            else:
+                stack.append(page)
+            depth = len(stack)
+            for pos in range(1, depth):
+                resident = stack[pos]
+                if resident == page:
+                    stack[pos] = carry
+                    distances[i] = pos + 1
+                    carry = None
+                    break
+                if priority[carry] < priority[resident]:
+                    stack[pos] = carry
+                    carry = resident
+            if carry is not None and (max_size is None or depth < max_size):
+                stack.append(carry)
+        priority[page] = next_use[i]
+    return distances
+
+
+def hit_curve(distances, max_size=None):
+    """
+    Turn a list of stack distances into cumulative hit counts.
+    Returns hits where hits[c] is the number of hits with c frames, for c from 0
+    up to max_size (by default the largest finite distance, i.e. the number of
+    distinct pages that are ever re-referenced).
+    """
+    if max_size is None:
+        max_size = max(distances, default=0)
+    histogram = [0] * (max_size + 1)
+    for d in distances:
+        if 0 < d <= max_size:
+            histogram[d] += 1
+    hits = [0] * (max_size + 1)
+    running = 0
+    for c in range(1, max_size + 1):
+        running += histogram[c]
+        hits[c] = running
+    return hits
+
+
+def lru_hit_curve(trace):
+    """
+    Hit counts of an LRU cache for every frame count from 0 to the number of
+    distinct pages in the trace, from a single pass over it.
+    """
+    return hit_curve(lru_stack_distances(trace), len(set(trace)))
+
+
+def opt_hit_curve(trace, max_size=None):
+    """
+    Hit counts of Belady's OPT for every frame count from 0 to max_size (by
+    default the number of distinct pages in the trace), from a single pass
+    costing O(n * max_size), see opt_stack_distances. Pass the largest frame
+    count that will be read; for a few sizes of a long trace,
+    optimal.simulate_optimal per size is faster.
+    """
+    if max_size is None:
+        max_size = len(set(trace))
+    return hit_curve(opt_stack_distances(trace, max_size), max_size)
+
+
+def fifo_hits(trace, frame_sizes):
+    """
+    Hit counts of FIFO for each of the requested frame counts, from one pass
+    over the trace: every chunk of FIFO_CHUNK accesses is converted once and
+    fed to a ring-buffer FIFO per capacity, so memory is O(sum of the frame
+    counts) plus one chunk.
+    Returns:
+        A list with the hits for every entry of frame_sizes, in that order.
+    """
+    fifos = [_FIFORing(frames) for frames in frame_sizes]
+    for start in range(0, len(trace), FIFO_CHUNK):
+        pages = trace[start:start + FIFO_CHUNK]
+        if isinstance(pages, np.ndarray):
+            pages = pages.tolist()
+        for fifo in fifos:
+            fifo.feed(pages)
+    return [fifo.hits for fifo in fifos]
+
+
+class _FIFORing():
+    # A FIFO cache of `frames` pages: a ring buffer in insertion order, whose
+    # next slot holds the oldest page once it is full, and a set of the same
+    # pages for membership.
+    def __init__(self, frames):
+        self.frames = frames
+        self.hits = 0
+        self._ring = [None] * max(frames, 0)
+        self._next = 0
+        self._resident = set()
+
+    def feed(self, pages):
+        frames = self.frames
+        if frames < 1:
+            return
+        ring = self._ring
+        resident = self._resident
+        slot = self._next
+        hits = 0
+        i = 0
+        # fill the free frames, then every miss evicts the oldest page
+        while len(resident) < frames and i < len(pages):
+            page = pages[i]
+            i += 1
+            if page in resident:
+                hits += 1
+                continue
+            ring[slot] = page
+            resident.add(page)
+            slot = (slot + 1) % frames
+        for page in pages[i:] if i else pages:
+            if page in resident:
+                hits += 1
+                continue
+            resident.remove(ring[slot])
+            ring[slot] = page
+            resident.add(page)
+            slot += 1
+            if slot == frames:
+                slot = 0
+        self._next = slot
+        self.hits += hits
+
+
+def belady_anomalies(frame_sizes, hits):
+    """
+    Frame counts where adding frames lost hits: (smaller, larger) pairs of
+    neighbouring requested sizes with hits[larger] < hits[smaller].
+    """
+    points = sorted(zip(frame_sizes, hits))
+    return [(small, large)
+            for (small, small_hits), (large, large_hits) in zip(points, points[1:])
+            if large > small and large_hits < small_hits]
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "data.txt"
+
+    # === Load trace from data.txt ===
+    trace = load_trace(path).tolist()
+
+    n = len(trace)
+    hits = lru_hit_curve(trace)
+    distinct = len(hits) - 1
+    sizes = [frames
+             for frames in (1, 10, 100, 500, 1000, 2000, 5000, distinct)
+             if frames < len(hits)]
+    # with every distinct page resident any policy misses only cold references,
+    # so OPT is only needed up to the largest smaller size
+    opt_hits = opt_hit_curve(
+        trace, max([frames for frames in sizes if frames < distinct], default=1))
+    opt_hits += hits[len(opt_hits):]
+    fifo = fifo_hits(trace, sizes)
+
+    print("FIFO / LRU / OPT Miss-Ratio Curves (single pass)")
+    print(f"Access Trace Size: {n}")
+    print(f"Distinct Pages: {len(hits) - 1}")
+    print(f"{'Frames':>8} {'FIFO Hits':>9} {'FIFO Rate':>9} "
+          f"{'LRU Hits':>9} {'LRU Rate':>9} "
+          f"{'OPT Hits':>9} {'OPT Rate':>9}")
+    for frames, fifo_frames_hits in zip(sizes, fifo):
+        print(f"{frames:>8} {fifo_frames_hits:>9} "
+              f"{fifo_frames_hits / n * 100:>8.2f}% "
+              f"{hits[frames]:>9} "
+              f"{hits[frames] / n * 100:>8.2f}% "
+              f"{opt_hits[frames]:>9} "
+              f"{opt_hits[frames] / n * 100:>8.2f}%")
+    for small, large in belady_anomalies(sizes, fifo):
+        print(f"Belady's anomaly: FIFO loses hits going from {small} "
+              f"to {large} frames")
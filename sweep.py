@@ -0,0 +1,134 @@
+"""
+Parallel sweep over algorithms x frame sizes x seeds.
+The trace is converted to the binary format once and every worker memory-maps
+the same file, so it is shared through the page cache instead of being pickled
+to each process. Each grid point runs in its own task on a ProcessPoolExecutor
+and the results come back as one table, one row per (algorithm, frames, seed).
+Seeds only apply to randomized policies (those taking a seed argument); the
+others run once per frame size.
+"""
+import argparse
+import csv
+import inspect
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from policies import POLICIES, hit_count
+from trace_io import ensure_binary, open_trace
+
+COLUMNS = ("algorithm", "frames", "seed", "accesses", "hits", "faults",
+           "hit_rate", "seconds")
+
+_trace = None
+
+
+def _init_worker(trace_path, offset, length):
+    global _trace
+    _trace = open_trace(trace_path, offset, length)
+
+
+def _run_point(point):
+    algorithm, frames, seed = point
+    policy_class = POLICIES[algorithm]
+    kwargs = {} if seed is None else {"seed": seed}
+    t = time.perf_counter()
+    mask = policy_class(frames, **kwargs).run(_trace)
+    seconds = time.perf_counter() - t
+    hits = hit_count(mask)
+    return {
+        "algorithm": algorithm,
+        "frames": frames,
+        "seed": seed,
+        "accesses": len(mask),
+        "hits": hits,
+        "faults": len(mask) - hits,
+        "hit_rate": hits / len(mask) if len(mask) else 0.0,
+        "seconds": seconds,
+    }
+
+
+def _takes_seed(policy_class):
+    return "seed" in inspect.signature(policy_class.__init__).parameters
+
+
+def sweep_grid(algorithms, frame_sizes, seeds=(None,)):
+    """List the (algorithm, frames, seed) points of the grid."""
+    points = []
+    for algorithm in algorithms:
+        if algorithm not in POLICIES:
+            raise ValueError(f"unknown algorithm {algorithm!r}, "
+                             f"expected one of {', '.join(POLICIES)}")
+        algorithm_seeds = seeds if _takes_seed(POLICIES[algorithm]) else (None,)
+        for frames in frame_sizes:
+            for seed in algorithm_seeds:
+                points.append((algorithm, frames, seed))
+    return points
+
+
+def run_sweep(trace_path, algorithms, frame_sizes, seeds=(None,), offset=0,
+              length=None, workers=None):
+    """
+    Run every point of the grid on the trace and return the rows of the
+    results table, ordered as the grid.
+    Parameters:
+        trace_path: str
+            Text or binary trace.
+        algorithms: list of policy names from policies.POLICIES
+        frame_sizes: list of int
+        seeds: list of int or None
+        offset, length: int (optional)
+            Window of the trace to simulate.
+        workers: int (optional)
+            Number of processes, by default one per core.
+    """
+    trace_path = ensure_binary(trace_path)
+    points = sweep_grid(algorithms, frame_sizes, seeds)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(trace_path, offset, length)) as pool:
+        return list(pool.map(_run_point, points))
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_table(rows):
+    print(f"{'Algorithm':>10} {'Frames':>8} {'Seed':>6} {'Hits':>10} "
+          f"{'Faults':>10} {'Hit Rate':>9} {'Seconds':>9}")
+    for row in rows:
+        seed = "-" if row["seed"] is None else row["seed"]
+        print(f"{row['algorithm']:>10} {row['frames']:>8} {seed:>6} "
+              f"{row['hits']:>10} {row['faults']:>10} "
+              f"{row['hit_rate'] * 100:>8.2f}% {row['seconds']:>9.3f}")
+
+
+def _int_list(text):
+    return [int(x) for x in text.split(",") if x]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep algorithms x frame sizes x seeds.")
+    parser.add_argument("trace", nargs="?", default="data.txt")
+    parser.add_argument("--algorithms", default=",".join(POLICIES),
+                        help="comma separated policy names")
+    parser.add_argument("--frames", type=_int_list, default=[100, 500, 1000, 2000])
+    parser.add_argument("--seeds", type=_int_list, default=[42])
+    parser.add_argument("--offset", type=int, default=0)
+    parser.add_argument("--length", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--csv", default=None, help="also write the table here")
+    args = parser.parse_args()
+
+    t = time.perf_counter()
+    rows = run_sweep(args.trace, args.algorithms.split(","), args.frames,
+                     args.seeds, args.offset, args.length, args.workers)
+    print_table(rows)
+    print(f"\n{len(rows)} runs in {time.perf_counter() - t:.2f} seconds "
+          f"on {args.workers} workers", file=sys.stderr)
+    if args.csv:
+        write_csv(args.csv, rows)
@@ -1,43 +1,234 @@
+from array import array
 from collections import deque
 
+import numpy as np
+
+from event_log import NO_VICTIM, EventLog
+
+_FIBONACCI = 0x9E3779B97F4A7C15  # 2**64 / golden ratio, odd
+_MASK64 = (1 << 64) - 1
+
 
 class TACClockCache:
     class Page:
+        __slots__ = ("number", "reference", "tendency")
+
         def __init__(self, number):
             self.number = number
             self.reference = 1
             self.tendency = 1
 
-    def __init__(self, capacity):
+    def __init__(self, capacity, trace=False):
         self.capacity = capacity
         self.frames = []
+        self.slots = {}  # page number -> index in self.frames
         self.hand = 0
+        self.trace = trace  # return a frame snapshot from every access
+        self.victim = None  # page evicted by the last access, if any
+
+    def snapshot(self):
+        return [f.number for f in self.frames]
 
     def access(self, page_number):
-        for p in self.frames:
-            if p.number == page_number:
-                p.reference = 1
-                return "Hit", [f.number for f in self.frames]
+        self.victim = None
+        slot = self.slots.get(page_number)
+        if slot is not None:
+            self.frames[slot].reference = 1
+            return "Hit", self.snapshot() if self.trace else None
 
         if len(self.frames) < self.capacity:
+            self.slots[page_number] = len(self.frames)
             self.frames.append(self.Page(page_number))
-            return "Fault", [f.number for f in self.frames]
+            return "Fault", self.snapshot() if self.trace else None
 
         while True:
             p = self.frames[self.hand]
             if p.reference == 0 and p.tendency == 0:
-                self.frames[self.hand] = self.Page(page_number)
+                # reuse the victim's frame in place
+                del self.slots[p.number]
+                self.victim = p.number
+                self.slots[page_number] = self.hand
+                p.number = page_number
+                p.reference = 1
+                p.tendency = 1
                 self.hand = (self.hand + 1) % self.capacity
-                return "Fault", [f.number for f in self.frames]
+                return "Fault", self.snapshot() if self.trace else None
             if p.reference == 0:
                 p.tendency -= 1
             p.reference = 0
             self.hand = (self.hand + 1) % self.capacity
 
 
-def simulate(cache_class, name, sequence, frame_size):
+class ArrayTACClockCache:
+    # TA-CLOCK over a columnar frame table: page ids in an array('q'), the
+    # reference bits and tendencies in bytearrays, and the page -> frame index
+    # an open-addressing table of frame numbers (linear probing, the page of a
+    # slot is read back from self.pages): 10 bytes per frame plus 16 to 32
+    # for the index, against some 180 for the Page objects and dict of
+    # TACClockCache.
+    # The hand steps frame by frame like TACClockCache and only switches to
+    # vectorized scans once a sweep has run past SCALAR_STEPS frames.
+    SCALAR_STEPS = 64
+    VECTOR_WIDTH = 1024  # first window of a vectorized scan, doubled each time
+
+    def __init__(self, capacity, trace=False):
+        self.capacity = capacity
+        self.pages = array("q", bytes(8 * capacity))
+        self.reference = bytearray(capacity)
+        self.tendency = bytearray(capacity)
+        # NumPy views of the same bytes, for the long runs of _sweep
+        self._reference = np.frombuffer(self.reference, dtype=np.uint8)
+        self._tendency = np.frombuffer(self.tendency, dtype=np.uint8)
+        self.size = 0
+        self.hand = 0
+        self.trace = trace
+        self.victim = None  # page evicted by the last access, if any
+        self._make_index()
+
+    def _make_index(self):
+        # at least four table entries per frame keeps probes short;
+        # a page's home entry is the top bits of page * 2**64 / golden ratio
+        bits = max(4 * self.capacity - 1, 1).bit_length()
+        self._shift = 64 - bits
+        self._mask = (1 << bits) - 1
+        self.table = array("i", [-1]) * (1 << bits)
+
+    def snapshot(self):
+        return self.pages[:self.size].tolist()
+
+    def access(self, page_number):
+        self.victim = None
+        pages, table, mask = self.pages, self.table, self._mask
+        home = ((page_number * _FIBONACCI) & _MASK64) >> self._shift
+        i = home
+        slot = table[i]
+        while slot >= 0:
+            if pages[slot] == page_number:
+                self.reference[slot] = 1
+                return "Hit", self.snapshot() if self.trace else None
+            i = (i + 1) & mask
+            slot = table[i]
+
+        if self.size < self.capacity:
+            slot = self.size
+            self.size += 1
+        else:
+            slot = self._sweep()
+            self.victim = pages[slot]
+            self._unlink(slot)
+            self.hand = (slot + 1) % self.capacity
+            # the unlink may have opened a hole earlier in this page's run
+            i = home
+            while table[i] >= 0:
+                i = (i + 1) & mask
+        table[i] = slot
+        pages[slot] = page_number
+        self.reference[slot] = 1
+        self.tendency[slot] = 1
+        return "Fault", self.snapshot() if self.trace else None
+
+    def _unlink(self, slot):
+        # Drop frame slot from the table and shift later entries of its probe
+        # run back into the hole, so lookups never need tombstones.
+        pages, table, mask, shift = self.pages, self.table, self._mask, self._shift
+        i = ((pages[slot] * _FIBONACCI) & _MASK64) >> shift
+        while table[i] != slot:
+            i = (i + 1) & mask
+        j = i
+        while True:
+            j = (j + 1) & mask
+            moved = table[j]
+            if moved < 0:
+                break
+            home = ((pages[moved] * _FIBONACCI) & _MASK64) >> shift
+            # entries whose home lies cyclically in (i, j] stay where they are
+            if (home - i - 1) & mask >= (j - i) & mask:
+                table[i] = moved
+                i = j
+        table[i] = -1
+
+    def _sweep(self):
+        # Every frame the hand passes loses its reference bit, or a unit of
+        # tendency if the bit was already clear, until one with neither is
+        # found. Short sweeps are stepped one frame at a time as in
+        # TACClockCache; longer ones continue in vectorized windows.
+        reference, tendency = self.reference, self.tendency
+        capacity = self.capacity
+        hand = self.hand
+        for _ in range(self.SCALAR_STEPS):
+            if reference[hand]:
+                reference[hand] = 0
+            elif tendency[hand]:
+                tendency[hand] -= 1
+            else:
+                return hand
+            hand += 1
+            if hand == capacity:
+                hand = 0
+        return self._scan(hand)
+
+    def _scan(self, start):
+        # The steps of _sweep applied to a window of frames at a time. The
+        # window doubles until a victim is found, which takes at most three
+        # laps since tendency starts at 1.
+        width = self.VECTOR_WIDTH
+        while True:
+            end = min(start + width, self.capacity)
+            reference = self._reference[start:end]
+            tendency = self._tendency[start:end]
+            eligible = (reference == 0) & (tendency == 0)
+            j = int(eligible.argmax())
+            if eligible[j]:
+                tendency[:j] -= reference[:j] == 0
+                reference[:j] = 0
+                return start + j
+            tendency -= reference == 0
+            reference[:] = 0
+            start = end % self.capacity
+            width *= 2
+
+
+class DenseTACClockCache(ArrayTACClockCache):
+    # ArrayTACClockCache for traces remapped to dense page ids 0..num_pages-1
+    # (see trace_io.densify): the page -> frame index is a flat array('i')
+    # indexed by page id, so a lookup is a single array read.
+    def __init__(self, capacity, num_pages, trace=False):
+        self.num_pages = num_pages
+        super().__init__(capacity, trace)
+
+    def _make_index(self):
+        self.slots = array("i", [-1]) * self.num_pages
+
+    def access(self, page_number):
+        self.victim = None
+        slots = self.slots
+        slot = slots[page_number]
+        if slot >= 0:
+            self.reference[slot] = 1
+            return "Hit", self.snapshot() if self.trace else None
+
+        if self.size < self.capacity:
+            slot = self.size
+            self.size += 1
+        else:
+            slot = self._sweep()
+            self.victim = self.pages[slot]
+            slots[self.victim] = -1
+            self.hand = (slot + 1) % self.capacity
+        self.pages[slot] = page_number
+        self.reference[slot] = 1
+        self.tendency[slot] = 1
+        slots[page_number] = slot
+        return "Fault", self.snapshot() if self.trace else None
+
+
+def simulate(cache_class, name, sequence, frame_size, verbose=True,
+             event_log=None):
+    # event_log: path of an .npz to record every access to (see event_log.py),
+    # the way to inspect eviction decisions on runs too long to print
     print(f"\n{name} Simulation Start")
-    cache = cache_class(frame_size)
+    cache = cache_class(frame_size, trace=verbose)
+    events = EventLog(event_log) if event_log else None
     hits, faults = 0, 0
 
     for i, page in enumerate(sequence):
@@ -46,8 +237,16 @@ def simulate(cache_class, name, sequence, frame_size):
             hits += 1
         else:
             faults += 1
-        print(f"[Step {i}] Access: {page} => {result}")
-        print(f"Frames: {state}")
+        if events is not None:
+            victim = NO_VICTIM if cache.victim is None else cache.victim
+            events.record(i, page, result == "Hit", victim)
+        if verbose:
+            print(f"[Step {i}] Access: {page} => {result}")
+            print(f"Frames: {state}")
+
+    if events is not None:
+        events.close()
+        print(f"Logged {events.count} events to {events.path}")
 
     total = hits + faults
     hit_rate = hits / total * 100
@@ -58,9 +257,10 @@ def simulate(cache_class, name, sequence, frame_size):
     print("-" * 40)
 
 
-# 실행
-access_sequence = [1, 2, 3, 2, 4, 1, 5, 2, 1, 4, 3, 2, 1, 5, 4]
+if __name__ == "__main__":
+    # 실행
+    access_sequence = [1, 2, 3, 2, 4, 1, 5, 2, 1, 4, 3, 2, 1, 5, 4]
 
-frame_size = 4
+    frame_size = 4
 
-simulate(TACClockCache, "TA-CLOCK", access_sequence, frame_size)
+    simulate(TACClockCache, "TA-CLOCK", access_sequence, frame_size)
@@ -0,0 +1,160 @@
+"""
+Frequency estimation for the W-TinyLFU admission filter in policies.py.
+CountMinSketch counts references in depth rows of 4-bit counters, two to a
+byte, and estimates a page's frequency as the smallest of its counters. A
+Doorkeeper Bloom filter in front of it absorbs the first reference of every
+page, so pages seen once (most of a long trace) never touch the sketch. After
+sample_size references both are aged: every counter is halved and the
+doorkeeper is cleared, so the estimates follow changes in popularity.
+Memory is fixed at construction, a few bytes per cache frame, whatever the
+number of distinct pages.
+"""
+
+COUNTER_MAX = 15  # 4-bit counters
+# a key is hashed once to 64 bits with the splitmix64 finalizer (as in
+# shards.page_hash), so page-aligned ids spread as well as random ones, and
+# the position for row (or filter hash) i is h + i * (h >> 32 | 1), masked
+_MASK = (1 << 64) - 1
+_SKETCH_SEED = 0x9E3779B97F4A7C15
+_DOORKEEPER_SEED = 0xD6E8FEB86659FD93
+_MIX_1 = 0xBF58476D1CE4E5B9
+_MIX_2 = 0x94D049BB133111EB
+# byte -> byte with both 4-bit counters halved
+_HALVE = bytes(((b >> 1) & 0x77) for b in range(256))
+
+
+def _hash(key, seed):
+    h = (hash(key) + seed) & _MASK
+    h = ((h ^ h >> 30) * _MIX_1) & _MASK
+    h = ((h ^ h >> 27) * _MIX_2) & _MASK
+    return h ^ h >> 31
+
+
+def _power_of_two(count):
+    return 1 << max(1, (int(count) - 1).bit_length())
+
+
+class CountMinSketch():
+    def __init__(self, width, depth=4):
+        """
+        Parameters:
+            width: int
+                Counters per row, rounded up to a power of two; about the
+                number of cache frames.
+            depth: int
+                Rows.
+        """
+        if depth < 1:
+            raise ValueError("depth must be positive")
+        self.depth = depth
+        self.width = _power_of_two(width)
+        self._mask = self.width - 1
+        self._rows = [bytearray(self.width // 2) for _ in range(depth)]
+
+    def increment(self, key):
+        h = _hash(key, _SKETCH_SEED)
+        step = h >> 32 | 1
+        mask = self._mask
+        for row in self._rows:
+            i = h & mask
+            b = row[i >> 1]
+            if i & 1:
+                if b < 0xF0:
+                    row[i >> 1] = b + 0x10
+            elif b & 0x0F < COUNTER_MAX:
+                row[i >> 1] = b + 1
+            h += step
+
+    def estimate(self, key):
+        h = _hash(key, _SKETCH_SEED)
+        step = h >> 32 | 1
+        mask = self._mask
+        count = COUNTER_MAX
+        for row in self._rows:
+            i = h & mask
+            c = row[i >> 1] >> 4 if i & 1 else row[i >> 1] & 0x0F
+            if c < count:
+                count = c
+            h += step
+        return count
+
+    def halve(self):
+        self._rows = [bytearray(row.translate(_HALVE)) for row in self._rows]
+
+
+class Doorkeeper():
+    def __init__(self, bits, hashes=2):
+        """
+        Bloom filter of the pages referenced since the last reset.
+        Parameters:
+            bits: int
+                Size of the filter, rounded up to a power of two.
+            hashes: int
+        """
+        size = _power_of_two(max(bits, 8))
+        self._mask = size - 1
+        self._bits = bytearray(size // 8)
+        self.hashes = hashes
+
+    def __contains__(self, key):
+        h = _hash(key, _DOORKEEPER_SEED)
+        step = h >> 32 | 1
+        bits = self._bits
+        mask = self._mask
+        for _ in range(self.hashes):
+            p = h & mask
+            if not bits[p >> 3] >> (p & 7) & 1:
+                return False
+            h += step
+        return True
+
+    def add(self, key):
+        """Add the key; returns True if it was (probably) there already."""
+        h = _hash(key, _DOORKEEPER_SEED)
+        step = h >> 32 | 1
+        bits = self._bits
+        mask = self._mask
+        present = True
+        for _ in range(self.hashes):
+            p = h & mask
+            bit = 1 << (p & 7)
+            if not bits[p >> 3] & bit:
+                bits[p >> 3] |= bit
+                present = False
+            h += step
+        return present
+
+    def clear(self):
+        self._bits = bytearray(len(self._bits))
+
+
+class FrequencySketch():
+    def __init__(self, frames, sample_factor=10, depth=4, doorkeeper=True):
+        """
+        TinyLFU frequency estimates for a cache of the given size: a
+        CountMinSketch of about frames counters per row, behind a Doorkeeper
+        sized to the sample, aged every sample_factor * frames references.
+        """
+        self.sample_size = max(1, int(sample_factor * frames))
+        self.sketch = CountMinSketch(max(16, frames), depth)
+        self.doorkeeper = Doorkeeper(self.sample_size) if doorkeeper else None
+        self._additions = 0
+
+    def record(self, key):
+        if self.doorkeeper is None or self.doorkeeper.add(key):
+            self.sketch.increment(key)
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            self.reset()
+
+    def frequency(self, key):
+        count = self.sketch.estimate(key)
+        if self.doorkeeper is not None and key in self.doorkeeper:
+            count += 1
+        return count
+
+    def reset(self):
+        self.sketch.halve()
+        if self.doorkeeper is not None:
+            self.doorkeeper.clear()
+        self._additions //= 2
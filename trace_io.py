@@ -0,0 +1,265 @@
+"""
+Binary trace format and shared trace loader.
+Text traces (one page id per line, or separated by commas/whitespace) are
+converted once into a compact binary file and then opened with numpy.memmap, so
+loading is near-instant and only the pages that are actually touched get read.
+A binary trace is a 16 byte header followed by the page ids as little-endian
+unsigned integers:
+    magic   4 bytes   b"PTRC"
+    version uint16    1
+    width   uint16    bytes per page id, 4 (uint32) or 8 (uint64); text
+                      traces get 4 unless some page id needs 8
+    count   uint64    number of page ids
+Slicing with offset/length maps only the requested window of the file.
+A trace can also be remapped to dense page ids 0..U-1, stored as
+<stem>.dense.trace with the original id of every dense id in <stem>.pages.npy,
+so engines can index flat arrays by page instead of hashing raw ids.
+"""
+import os
+import struct
+import sys
+
+import numpy as np
+
+MAGIC = b"PTRC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")
+TRACE_SUFFIX = ".trace"
+DENSE_SUFFIX = ".dense.trace"
+PAGES_SUFFIX = ".pages.npy"
+
+_DTYPES = {4: np.dtype("<u4"), 8: np.dtype("<u8")}
+
+
+def _read_header(path):
+    with open(path, "rb") as f:
+        raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise ValueError(f"{path} is not a binary trace")
+    magic, version, width, count = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a binary trace")
+    if version != VERSION or width not in _DTYPES:
+        raise ValueError(
+            f"{path}: unsupported trace version {version} / width {width}")
+    return _DTYPES[width], count
+
+
+def is_binary_trace(path):
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _text_chunks(path, chunk_bytes):
+    # yield uint64 arrays of page ids, reading about chunk_bytes of text at a time
+    with open(path, "r") as f:
+        while True:
+            lines = f.readlines(chunk_bytes)
+            if not lines:
+                break
+            tokens = "".join(lines).replace(",", " ").split()
+            if tokens:
+                yield np.array(tokens, dtype=np.uint64)
+
+
+class TraceWriter():
+    def __init__(self, path, dtype="uint32"):
+        """
+        Incrementally write page ids to a binary trace; the count in the header
+        is filled in on close.
+        Parameters:
+            path: str
+                Destination file.
+            dtype: "uint32" or "uint64"
+        """
+        dtype = np.dtype(dtype).newbyteorder("<")
+        if dtype.itemsize not in _DTYPES or dtype.kind != "u":
+            raise ValueError("dtype must be uint32 or uint64")
+        self.path = path
+        self.count = 0
+        self._dtype = dtype
+        self._limit = np.iinfo(dtype).max
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, dtype.itemsize, 0))
+
+    def append(self, chunk):
+        chunk = np.asarray(chunk)
+        if chunk.size == 0:
+            return
+        if chunk.min() < 0 or int(chunk.max()) > self._limit:
+            advice = ", use uint64" if self._dtype.itemsize < 8 else ""
+            raise ValueError(
+                f"page id out of range for {self._dtype.name}{advice}")
+        self._file.write(chunk.astype(self._dtype, copy=False).tobytes())
+        self.count += chunk.size
+
+    def close(self):
+        if self._file.closed:
+            return
+        # patch the final count into the header
+        self._file.seek(0)
+        self._file.write(
+            HEADER.pack(MAGIC, VERSION, self._dtype.itemsize, self.count))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_trace(path, chunks, dtype="uint32"):
+    """
+    Write an iterable of page id arrays to a binary trace.
+    Returns the number of page ids written.
+    """
+    with TraceWriter(path, dtype) as writer:
+        for chunk in chunks:
+            writer.append(chunk)
+    return writer.count
+
+
+def convert_text_trace(text_path, out_path=None, dtype=None,
+                       chunk_bytes=1 << 24):
+    """
+    Convert a text trace to the binary format, reading it in chunks so memory
+    stays bounded. Returns the path of the binary trace.
+    dtype is "uint32" or "uint64"; by default it is picked from the data:
+    uint32, unless some page id does not fit, in which case the conversion is
+    redone as uint64.
+    """
+    if out_path is None:
+        out_path = os.path.splitext(text_path)[0] + TRACE_SUFFIX
+    # write beside the target and rename, so concurrent readers never see a
+    # half-written trace
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    try:
+        try:
+            write_trace(tmp_path, _text_chunks(text_path, chunk_bytes),
+                        dtype or "uint32")
+        except ValueError:
+            if dtype is not None:
+                raise
+            write_trace(tmp_path, _text_chunks(text_path, chunk_bytes),
+                        "uint64")
+        os.replace(tmp_path, out_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return out_path
+
+
+def open_trace(path, offset=0, length=None):
+    """
+    Memory-map a binary trace, or the window [offset, offset + length) of it,
+    without reading the rest of the file.
+    """
+    dtype, count = _read_header(path)
+    offset = min(max(offset, 0), count)
+    if length is None or offset + length > count:
+        length = count - offset
+    if length == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r",
+                     offset=HEADER.size + offset * dtype.itemsize,
+                     shape=(length,))
+
+
+def ensure_binary(path, dtype=None):
+    """
+    Return the path of a binary version of the trace. A text trace is converted
+    to a .trace file next to it the first time (and again whenever the text is
+    newer, or dtype asks for another width than the existing file has).
+    dtype is passed to convert_text_trace; by default the width is picked from
+    the data.
+    """
+    if is_binary_trace(path):
+        return path
+    binary_path = os.path.splitext(path)[0] + TRACE_SUFFIX
+    if (not os.path.exists(binary_path)
+            or os.path.getmtime(binary_path) < os.path.getmtime(path)
+            or (dtype is not None and _read_header(binary_path)[0]
+                != np.dtype(dtype).newbyteorder("<"))):
+        convert_text_trace(path, binary_path, dtype)
+    return binary_path
+
+
+def load_trace(path, offset=0, length=None, dtype=None):
+    """
+    Open a trace for simulation, text or binary, as a memory-mapped array (see
+    ensure_binary and open_trace). dtype only applies to converting a text
+    trace.
+    """
+    return open_trace(ensure_binary(path, dtype), offset, length)
+
+
+def densify(trace):
+    """
+    Remap page ids to dense ids 0..U-1 in one vectorized pass, with dense ids
+    assigned in order of the original id.
+    Returns:
+        (dense, pages) where dense is the remapped trace as uint32 and
+        pages[d] is the original id of dense id d.
+    """
+    pages, dense = np.unique(np.asarray(trace), return_inverse=True)
+    return dense.astype(np.uint32).reshape(-1), pages
+
+
+def _stem(path):
+    stem = os.path.splitext(path)[0]
+    if stem.endswith(".dense"):
+        stem = stem[:-len(".dense")]
+    return stem
+
+
+def densify_trace(path, streaming=False, chunk_size=1 << 24):
+    """
+    Write the dense version of a trace next to it, as <stem>.dense.trace, and
+    its mapping as <stem>.pages.npy. By default the whole trace is remapped
+    with np.unique. With streaming=True the trace is remapped chunk by chunk
+    through a hash map instead, assigning dense ids in order of first
+    appearance, so only the distinct pages have to fit in memory.
+    Returns the path of the dense trace.
+    """
+    trace = load_trace(path)
+    stem = _stem(path)
+    dense_path = stem + DENSE_SUFFIX
+    if not streaming:
+        dense, pages = densify(trace)
+        write_trace(dense_path, [dense])
+    else:
+        ids = {}
+        with TraceWriter(dense_path) as writer:
+            for start in range(0, len(trace), chunk_size):
+                chunk = trace[start:start + chunk_size].tolist()
+                writer.append(np.fromiter(
+                    (ids.setdefault(p, len(ids)) for p in chunk),
+                    dtype=np.uint32, count=len(chunk)))
+        pages = np.fromiter(ids, dtype=trace.dtype, count=len(ids))
+    np.save(stem + PAGES_SUFFIX, pages)
+    return dense_path
+
+
+def load_page_map(path):
+    """Memory-map the original ids of a dense trace; pages[d] is dense id d."""
+    return np.load(_stem(path) + PAGES_SUFFIX, mmap_mode="r")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("usage: python trace_io.py <text trace> [<binary trace>] [uint32|uint64]")
+        print("       python trace_io.py dense <trace> [streaming]")
+        sys.exit(1)
+    if sys.argv[1] == "dense":
+        dense_path = densify_trace(sys.argv[2], streaming=len(sys.argv) > 3)
+        pages = load_page_map(dense_path)
+        print(f"Wrote {len(open_trace(dense_path))} dense page ids "
+              f"({len(pages)} distinct) to {dense_path}")
+        sys.exit(0)
+    text_path = sys.argv[1]
+    out_path = sys.argv[2] if len(sys.argv) > 2 else None
+    dtype = sys.argv[3] if len(sys.argv) > 3 else None
+    out_path = convert_text_trace(text_path, out_path, dtype)
+    dtype, count = _read_header(out_path)
+    print(f"Wrote {count} page ids ({dtype.name}) to {out_path}")